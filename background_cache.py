@@ -0,0 +1,118 @@
+import base64
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from astrbot.api import logger
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# The background sits under a dark overlay, so detail beyond this edge length is not visible.
+MAX_EDGE = 2560
+# Without Pillow files are embedded unscaled; larger ones are skipped rather than bloating every render.
+RAW_MAX_BYTES = 4 * 1024 * 1024
+
+
+class BackgroundCache:
+    """Decode, fit and encode background files once, keyed by path + mtime.
+
+    Entries are the data URIs embedded into the render. With Pillow the image
+    is first cropped/scaled to the canvas for the configured fit and
+    re-encoded as JPEG; without it the file is cached as-is, up to
+    ``RAW_MAX_BYTES``. The cache is an LRU capped by the total size of the
+    stored URIs.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max(1, int(max_bytes))
+        self._entries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._warned: set = set()
+
+    def data_uri(self, path: str, canvas: Optional[Tuple[int, int]] = None, fit: str = "cover") -> str:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return ""
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, fit, canvas if Image is not None else None)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+        uri = self._build(path, canvas, fit)
+        if not uri:
+            return ""
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries:
+                self._entries[key] = uri
+                self._bytes += len(uri)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, dropped = self._entries.popitem(last=False)
+                self._bytes -= len(dropped)
+        return uri
+
+    def _build(self, path: str, canvas: Optional[Tuple[int, int]], fit: str) -> str:
+        if Image is None:
+            size = os.path.getsize(path)
+            if size > RAW_MAX_BYTES:
+                self._warn_once(path, f"Background {path} is {size / 1048576:.1f} MB; without Pillow only files up to "
+                                      f"{RAW_MAX_BYTES / 1048576:.0f} MB are embedded, so it is skipped. Install Pillow to downscale it.")
+                return ""
+            self._warn_once(None, "Pillow is not installed; background files are embedded without downscaling")
+            with open(path, "rb") as file:
+                data = file.read()
+            ext = os.path.splitext(path)[1][1:] or "jpeg"
+            return f"data:image/{ext};base64," + base64.b64encode(data).decode()
+        try:
+            with Image.open(path) as source:
+                image = self._fit(source.convert("RGB"), canvas, fit)
+        except Exception as exc:
+            logger.warning(f"Failed to preprocess background {path}: {exc}")
+            return ""
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=82, progressive=True)
+        logger.debug(f"Background {path} fitted to {image.width}x{image.height}, {buffer.tell() / 1024:.0f} KB")
+        return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+    def _warn_once(self, key: Optional[str], message: str):
+        with self._lock:
+            if key in self._warned:
+                return
+            self._warned.add(key)
+        logger.warning(message)
+
+    @staticmethod
+    def _fit(image, canvas: Optional[Tuple[int, int]], fit: str):
+        if not canvas:
+            image.thumbnail((MAX_EDGE, MAX_EDGE), Image.LANCZOS)
+            return image
+        width, height = canvas
+        shrink = min(1.0, MAX_EDGE / max(width, height))
+        width, height = max(1, int(width * shrink)), max(1, int(height * shrink))
+        if fit == "fill":
+            return image.resize((width, height), Image.LANCZOS)
+        if fit == "contain":
+            image.thumbnail((width, height), Image.LANCZOS)
+            return image
+        # cover: crop the source to the canvas aspect around the centre, then shrink (never enlarge).
+        scale = max(width / image.width, height / image.height)
+        crop_w, crop_h = min(image.width, round(width / scale)), min(image.height, round(height / scale))
+        left, top = (image.width - crop_w) // 2, (image.height - crop_h) // 2
+        image = image.crop((left, top, left + crop_w, top + crop_h))
+        if scale < 1:
+            image = image.resize((width, height), Image.LANCZOS)
+        return image
+
+
+BACKGROUND_CACHE = BackgroundCache()
@@ -0,0 +1,122 @@
+import datetime
+import re
+from typing import List, Optional, Set
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+    ZoneInfoNotFoundError = KeyError
+
+MONTH_NAMES = {name: idx + 1 for idx, name in enumerate(["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+DAY_NAMES = {name: idx for idx, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+DAILY_PATTERN = re.compile(r"^daily\s+(\d{1,2}):(\d{2})(?:\s+(\S+))?$", re.IGNORECASE)
+# Give up after this many days without a match (e.g. "0 0 30 2 *" never fires).
+SEARCH_DAYS = 366 * 5
+
+
+def resolve_timezone(name: Optional[str]) -> Optional[datetime.tzinfo]:
+    """``None`` means the host's local time; raises ValueError for unknown zones."""
+    if not name:
+        return None
+    if ZoneInfo is None:
+        raise ValueError("time zones need Python 3.9+ (zoneinfo)")
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown time zone: {name}")
+
+
+def _parse_field(text: str, low: int, high: int, names: Optional[dict] = None) -> Set[int]:
+    values: Set[int] = set()
+    for part in text.lower().split(","):
+        part, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"bad step in '{text}'")
+        if part == "*":
+            start, end = low, high
+        else:
+            first, _, last = part.partition("-")
+            start = int(names.get(first, first)) if names else int(first)
+            end = (int(names.get(last, last)) if names else int(last)) if last else (high if step_text else start)
+        if high == 7 and end == 7:
+            # Day of week: both 0 and 7 are Sunday.
+            values.add(0)
+            end = 6 if start <= 6 else 7
+        if not low <= start <= end <= high:
+            raise ValueError(f"'{text}' is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return {0 if high == 7 and value == 7 else value for value in values}
+
+
+class CronSchedule:
+    """Standard 5-field cron expression (minute hour day month weekday) in a time zone.
+
+    As in cron, when both day-of-month and day-of-week are restricted a day
+    matches if either does. ``next_after`` walks forward by month, day, hour
+    and minute, skipping whole units that cannot match.
+    """
+
+    def __init__(self, expression: str, timezone: Optional[str] = None):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError("cron expression needs 5 fields: minute hour day month weekday")
+        self.expression = " ".join(fields)
+        self.timezone = timezone or ""
+        self.tz = resolve_timezone(timezone)
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12, MONTH_NAMES)
+        self.weekdays = _parse_field(fields[4], 0, 7, DAY_NAMES)
+        # As in Vixie cron, a day field starting with "*" (even "*/2") makes the two combine with AND.
+        self._any_day = fields[2].startswith("*")
+        self._any_weekday = fields[4].startswith("*")
+
+    def __str__(self) -> str:
+        return f"{self.expression} {self.timezone}".strip()
+
+    def _day_matches(self, day: datetime.datetime) -> bool:
+        in_month = day.day in self.days
+        in_week = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, timestamp: float) -> float:
+        """Unix time of the first matching minute strictly after ``timestamp``."""
+        current = datetime.datetime.fromtimestamp(timestamp, self.tz).replace(tzinfo=None, second=0, microsecond=0)
+        current += datetime.timedelta(minutes=1)
+        limit = current + datetime.timedelta(days=SEARCH_DAYS)
+        while current < limit:
+            if current.month not in self.months:
+                current = (current.replace(day=1) + datetime.timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(current):
+                current = (current + datetime.timedelta(days=1)).replace(hour=0, minute=0)
+            elif current.hour not in self.hours:
+                current = (current + datetime.timedelta(hours=1)).replace(minute=0)
+            elif current.minute not in self.minutes:
+                current += datetime.timedelta(minutes=1)
+            else:
+                # Wall-clock times skipped by a DST change resolve to the instant after the gap.
+                fire_at = current.replace(tzinfo=self.tz).timestamp() if self.tz else current.timestamp()
+                if fire_at > timestamp:
+                    return fire_at
+                current += datetime.timedelta(minutes=1)
+        raise ValueError(f"cron expression '{self.expression}' never fires")
+
+
+def parse_schedule(text: str) -> CronSchedule:
+    """Parse ``daily HH:MM [tz]`` or a 5-field cron expression with an optional trailing time zone."""
+    text = " ".join(str(text or "").split())
+    match = DAILY_PATTERN.match(text)
+    if match:
+        hour, minute, timezone = int(match.group(1)), int(match.group(2)), match.group(3)
+        if hour > 23 or minute > 59:
+            raise ValueError(f"bad time of day: {hour}:{minute:02d}")
+        return CronSchedule(f"{minute} {hour} * * *", timezone)
+    fields: List[str] = text.split()
+    if len(fields) == 6:
+        return CronSchedule(" ".join(fields[:5]), fields[5])
+    return CronSchedule(text)
@@ -1,10 +1,18 @@
-﻿import datetime
+﻿import asyncio
+import dataclasses
+import datetime
+import functools
 import inspect
 import platform
 import psutil
 import re
-from monitor import collect_system_info
-from typing import Any, Dict, Iterable, List, Optional
+import time
+from astrbot.api import logger
+from monitor import DEFAULT_COLLECTOR_TIMEOUT, collect_system_info, host_static, run_collector
+from render_cache import SingleFlight
+from stats_pushdown import query_dashboard_aggregates, sqlite_path
+from utils import fmt_rate
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 THEME_PRESETS = {
     "custom_dashboard": {"page_bg": "#171735", "page_bg_end": "#0c1026", "surface_bg": "rgba(18,24,52,0.84)", "surface_alt": "rgba(34,42,78,0.92)", "border": "rgba(120,133,196,0.18)", "muted_text": "rgba(204,214,255,0.72)", "accent": "#7c6cff", "text": "#f8fbff"},
@@ -14,24 +22,54 @@ THEME_PRESETS = {
 }
 
 
-def dashboard_texts(locale: str) -> Dict[str, str]:
+# Dashboard stats windows: (hours, line chart bucket, token bar bucket, line label, bar label), buckets in seconds.
+# Message sources (platform_stats rows, the aggregator, the SQL pushdown) are hourly, so the message
+# line never goes below an hour; token bars come from per-conversation timestamps.
+STATS_WINDOWS = {
+    '1h': (1, 3600, 300, '%H:00', '%H:%M'),
+    '24h': (24, 3600, 3600, '%H:%M', '%H:%M'),
+    '7d': (24 * 7, 3600, 86400, '%m-%d %H:%M', '%m-%d'),
+    '30d': (24 * 30, 3600, 86400, '%m-%d', '%m-%d'),
+}
+WINDOW_LABELS = {
+    'zh': {'1h': '1 \u5c0f\u65f6', '24h': '24 \u5c0f\u65f6', '7d': '7 \u5929', '30d': '30 \u5929'},
+    'en': {'1h': '1h', '24h': '24h', '7d': '7d', '30d': '30d'},
+}
+# Line charts are downsampled to at most this many SVG points.
+LINE_CHART_POINTS = 60
+
+
+def stats_window(value: Any) -> str:
+    window = str(value or '').strip().lower()
+    return window if window in STATS_WINDOWS else '24h'
+
+
+# Text tables and theme tokens only depend on config, so build each variant once.
+@functools.lru_cache(maxsize=16)
+def dashboard_texts(locale: str, window: str = '24h') -> Dict[str, str]:
     zh = {
         "default_title": "\u7cfb\u7edf\u7edf\u8ba1", "subtitle": "\u5e73\u53f0\u3001\u6d88\u606f\u4e0e\u6a21\u578b\u8c03\u7528\u7684\u4e00\u89c8\u3002", "layout_hint": "DASHBOARD",
-        "platform_count": "\u5e73\u53f0\u6570\u91cf", "message_total": "\u6d88\u606f\u603b\u6570", "today_tokens": "\u4eca\u65e5 Tokens", "cpu": "CPU", "memory": "\u8fd0\u884c\u5185\u5b58", "uptime": "\u8fd0\u884c\u65f6\u957f",
-        "message_overview": "\u6d88\u606f\u6982\u89c8", "message_trend": "\u6d88\u606f\u8d8b\u52bf", "platform_ranking": "\u5e73\u53f0\u6d88\u606f\u6392\u540d", "model_usage": "\u6a21\u578b\u8c03\u7528", "token_trend": "\u8c03\u7528 Token \u8d8b\u52bf", "recent_tokens": "\u6700\u8fd1 1 \u5929 Token Top 10",
+        "platform_count": "\u5e73\u53f0\u6570\u91cf", "message_total": "\u6d88\u606f\u603b\u6570", "window_tokens": "{window} Tokens", "cpu": "CPU", "memory": "\u8fd0\u884c\u5185\u5b58", "uptime": "\u8fd0\u884c\u65f6\u957f",
+        "message_overview": "\u6d88\u606f\u6982\u89c8", "message_trend": "\u6d88\u606f\u8d8b\u52bf", "platform_ranking": "\u5e73\u53f0\u6d88\u606f\u6392\u540d", "model_usage": "\u6a21\u578b\u8c03\u7528", "token_trend": "\u8c03\u7528 Token \u8d8b\u52bf", "recent_tokens": "\u6700\u8fd1 {window} Token Top 10",
         "dashboard_user": "Dashboard \u7528\u6237", "provider": "\u5f53\u524d\u63d0\u4f9b\u5546", "model": "\u5f53\u524d\u6a21\u578b", "plugins": "\u63d2\u4ef6\u6570", "platforms": "\u5e73\u53f0\u6570", "providers": "\u63d0\u4f9b\u5546\u6570",
-        "messages_24h": "\u6700\u8fd1 24 \u5c0f\u65f6\u6d88\u606f", "tokens_24h": "\u6700\u8fd1 24 \u5c0f\u65f6 Tokens", "generated": "\u66f4\u65b0\u65f6\u95f4", "powered": "Powered by AstrBot", "no_data": "\u6682\u65e0\u6570\u636e",
-        "system": "\u7cfb\u7edf", "host": "\u4e3b\u673a", "processor": "\u5904\u7406\u5668", "system_status": "\u7cfb\u7edf\u72b6\u6001", "basic_info": "\u57fa\u7840\u4fe1\u606f", "network": "\u7f51\u7edc", "upload": "\u4e0a\u4f20", "download": "\u4e0b\u8f7d", "swap": "Swap", "disk": "\u78c1\u76d8", "disk_usage": "\u78c1\u76d8\u5360\u7528", "top_processes": "\u8fdb\u7a0b\u6392\u540d", "current_time": "\u5f53\u524d\u65f6\u95f4", "kernel": "Kernel", "no_partitions": "\u6682\u65e0\u78c1\u76d8\u6570\u636e"
+        "messages_24h": "\u6700\u8fd1 {window}\u6d88\u606f", "tokens_24h": "\u6700\u8fd1 {window} Tokens", "generated": "\u66f4\u65b0\u65f6\u95f4", "powered": "Powered by AstrBot", "no_data": "\u6682\u65e0\u6570\u636e",
+        "system": "\u7cfb\u7edf", "host": "\u4e3b\u673a", "processor": "\u5904\u7406\u5668", "system_status": "\u7cfb\u7edf\u72b6\u6001", "basic_info": "\u57fa\u7840\u4fe1\u606f", "network": "\u7f51\u7edc", "upload": "\u4e0a\u4f20", "download": "\u4e0b\u8f7d", "swap": "Swap", "disk": "\u78c1\u76d8", "disk_usage": "\u78c1\u76d8\u5360\u7528", "top_processes": "\u8fdb\u7a0b\u6392\u540d", "current_time": "\u5f53\u524d\u65f6\u95f4", "kernel": "Kernel", "no_partitions": "\u6682\u65e0\u78c1\u76d8\u6570\u636e",
+        "system_trend": "\u7cfb\u7edf\u8d8b\u52bf", "cpu_trend": "CPU \u8d8b\u52bf", "memory_trend": "\u5185\u5b58\u8d8b\u52bf", "network_trend": "\u7f51\u7edc\u8d8b\u52bf", "history_window": "\u6700\u8fd1 {hours} \u5c0f\u65f6", "history_days": "\u6700\u8fd1 {days} \u5929"
     }
     en = {
         "default_title": "System Stats", "subtitle": "Overview of platforms, messages, and model usage.", "layout_hint": "DASHBOARD",
-        "platform_count": "Platforms", "message_total": "Messages", "today_tokens": "Today Tokens", "cpu": "CPU", "memory": "Memory", "uptime": "Uptime",
-        "message_overview": "Message Overview", "message_trend": "Message Trend", "platform_ranking": "Platform Ranking", "model_usage": "Model Usage", "token_trend": "Token Trend", "recent_tokens": "Recent 24h Token Top 10",
+        "platform_count": "Platforms", "message_total": "Messages", "window_tokens": "{window} Tokens", "cpu": "CPU", "memory": "Memory", "uptime": "Uptime",
+        "message_overview": "Message Overview", "message_trend": "Message Trend", "platform_ranking": "Platform Ranking", "model_usage": "Model Usage", "token_trend": "Token Trend", "recent_tokens": "Recent {window} Token Top 10",
         "dashboard_user": "Dashboard User", "provider": "Current Provider", "model": "Current Model", "plugins": "Plugins", "platforms": "Platforms", "providers": "Providers",
-        "messages_24h": "Messages in 24h", "tokens_24h": "Tokens in 24h", "generated": "Updated", "powered": "Powered by AstrBot", "no_data": "No data",
-        "system": "System", "host": "Host", "processor": "Processor", "system_status": "System Status", "basic_info": "Basic Info", "network": "Network", "upload": "Upload", "download": "Download", "swap": "Swap", "disk": "Disk", "disk_usage": "Disk Usage", "top_processes": "Top Processes", "current_time": "Current Time", "kernel": "Kernel", "no_partitions": "No disk data"
+        "messages_24h": "Messages in {window}", "tokens_24h": "Tokens in {window}", "generated": "Updated", "powered": "Powered by AstrBot", "no_data": "No data",
+        "system": "System", "host": "Host", "processor": "Processor", "system_status": "System Status", "basic_info": "Basic Info", "network": "Network", "upload": "Upload", "download": "Download", "swap": "Swap", "disk": "Disk", "disk_usage": "Disk Usage", "top_processes": "Top Processes", "current_time": "Current Time", "kernel": "Kernel", "no_partitions": "No disk data",
+        "system_trend": "System Trend", "cpu_trend": "CPU Trend", "memory_trend": "Memory Trend", "network_trend": "Network Trend", "history_window": "Last {hours}h", "history_days": "Last {days} days"
     }
-    return zh if locale == 'zh' else en
+    texts = zh if locale == 'zh' else en
+    label = WINDOW_LABELS['zh' if locale == 'zh' else 'en'].get(window, window)
+    for key in ('recent_tokens', 'messages_24h', 'tokens_24h', 'window_tokens'):
+        texts[key] = texts[key].format(window=label)
+    return texts
 
 
 def normalize_hex(color: Any, fallback: str) -> str:
@@ -51,6 +89,7 @@ def hex_to_rgba(color: str, alpha: float) -> str:
     return f'rgba({red}, {green}, {blue}, {alpha})'
 
 
+@functools.lru_cache(maxsize=64)
 def build_theme_tokens(theme: str, accent_color: str, text_color: str) -> Dict[str, str]:
     preset = dict(THEME_PRESETS.get(theme, THEME_PRESETS['custom_dashboard']))
     accent = normalize_hex(accent_color, preset['accent'])
@@ -100,6 +139,7 @@ def mapping(obj: Any) -> Dict[str, Any]:
     for attr in ('model_dump', 'dict'):
         fn = getattr(obj, attr, None)
         if callable(fn):
+            EXTRACT_STATS['dumps'] += 1
             try:
                 data = fn()
                 if isinstance(data, dict):
@@ -112,7 +152,72 @@ def mapping(obj: Any) -> Dict[str, Any]:
     return {}
 
 
+# (row type, candidates) -> attribute names to read directly, or None for the generic path.
+_ACCESSORS: Dict[Any, Optional[Tuple[str, ...]]] = {}
+_OPEN_TYPES: set = set()
+# 'direct' lookups skip mapping() entirely; 'dumps' counts the model_dump()/dict() calls still made.
+EXTRACT_STATS = {'direct': 0, 'generic': 0, 'types': 0, 'dumps': 0}
+
+
+def _stage_profile(started: float, before: Dict[str, int]) -> str:
+    delta = {key: EXTRACT_STATS[key] - before.get(key, 0) for key in EXTRACT_STATS}
+    return (
+        f"{(time.perf_counter() - started) * 1000:.1f}ms, {delta['direct']} direct lookups (mapping() avoided), "
+        f"{delta['generic']} generic with {delta['dumps']} model_dump()/dict() calls, {delta['types']} row types resolved"
+    )
+
+
+def _declared_fields(cls: type) -> Optional[frozenset]:
+    """Attribute names every instance of ``cls`` exposes, or None if instances are open-ended."""
+    fields = getattr(cls, 'model_fields', None)
+    if isinstance(fields, dict):
+        config = getattr(cls, 'model_config', None) or {}
+        return None if config.get('extra') == 'allow' else frozenset(fields)
+    mapper = getattr(cls, '__mapper__', None)
+    if mapper is not None:
+        try:
+            return frozenset(attr.key for attr in mapper.attrs)
+        except Exception:
+            return None
+    if dataclasses.is_dataclass(cls):
+        return frozenset(field.name for field in dataclasses.fields(cls))
+    # __slots__ classes without __getattr__: slot members are class-level descriptors.
+    if getattr(cls, '__dictoffset__', 1) == 0 and getattr(cls, '__getattr__', None) is None:
+        return frozenset()
+    return None
+
+
+def _accessor(cls: type, candidates: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+    key = (cls, candidates)
+    try:
+        return _ACCESSORS[key]
+    except KeyError:
+        pass
+    fields = _declared_fields(cls)
+    if fields is None:
+        _OPEN_TYPES.add(cls)
+    names = None if fields is None else tuple(name for name in candidates if name in fields or hasattr(cls, name))
+    _ACCESSORS[key] = names
+    EXTRACT_STATS['types'] += 1
+    return names
+
+
 def extract_value(obj: Any, candidates: Iterable[str], default: Any = None) -> Any:
+    candidates = tuple(candidates)
+    cls = type(obj)
+    if cls is not dict and cls not in _OPEN_TYPES:
+        # Typed rows (pydantic, ORM, dataclass, slots) resolve their fields once per class
+        # and are read with getattr instead of dumping the whole row per lookup.
+        names = _accessor(cls, candidates)
+        if names is not None:
+            EXTRACT_STATS['direct'] += 1
+            for name in names:
+                value = getattr(obj, name, None)
+                if value is not None:
+                    return value
+            return default
+    if cls is not dict:
+        EXTRACT_STATS['generic'] += 1
     data = mapping(obj)
     for name in candidates:
         if name in data and data[name] is not None:
@@ -155,19 +260,56 @@ def round_hour(value: datetime.datetime) -> datetime.datetime:
     return value.replace(minute=0, second=0, microsecond=0)
 
 
-def build_hour_buckets(hours: int = 24) -> List[datetime.datetime]:
-    now = datetime.datetime.now()
-    start = round_hour(now - datetime.timedelta(hours=hours - 1))
-    return [start + datetime.timedelta(hours=i) for i in range(hours)]
+def looks_cumulative(values: List[float]) -> bool:
+    """Whether a time-ordered series reads as a running counter rather than per-bucket counts."""
+    return sum(1 for i in range(1, len(values)) if values[i] >= values[i - 1]) >= max(1, len(values) - 2)
+
+
+def floor_bucket(value: datetime.datetime, step: int) -> datetime.datetime:
+    """Start of the ``step``-second bucket holding ``value``, counted from local midnight."""
+    midnight = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight + datetime.timedelta(seconds=int((value - midnight).total_seconds()) // step * step)
 
 
-def build_line_chart(series: List[Dict[str, Any]]) -> Dict[str, Any]:
+def build_buckets(hours: int = 24, step: int = 3600) -> List[datetime.datetime]:
+    count = max(1, hours * 3600 // step)
+    end = floor_bucket(datetime.datetime.now(), step)
+    return [end - datetime.timedelta(seconds=step * (count - 1 - i)) for i in range(count)]
+
+
+def lttb_indices(values: List[float], threshold: int) -> List[int]:
+    """Largest-Triangle-Three-Buckets: indices of ``threshold`` points that keep the shape and peaks."""
+    count = len(values)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+    every = (count - 2) / (threshold - 2)
+    picked, anchor = [0], 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, count)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / max(1, next_end - next_start)
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((anchor - avg_x) * (values[j] - values[anchor]) - (anchor - j) * (avg_y - values[anchor]))
+            if area > best_area:
+                best, best_area = j, area
+        picked.append(best)
+        anchor = best
+    picked.append(count - 1)
+    return picked
+
+
+def build_line_chart(series: List[Dict[str, Any]], max_points: int = LINE_CHART_POINTS) -> Dict[str, Any]:
     width, height = 620, 220
     left, right, top, bottom = 18, 18, 16, 26
     max_value = max([item.get('value', 0) for item in series] + [1])
     plot_width, plot_height = width - left - right, height - top - bottom
+    # Points keep their position on the full time axis; only the kept ones are drawn.
+    indices = lttb_indices([float(item.get('value', 0)) for item in series], max_points)
     points, enriched = [], []
-    for idx, item in enumerate(series):
+    for idx in indices:
+        item = series[idx]
         ratio = 0.0 if max_value <= 0 else float(item.get('value', 0)) / float(max_value)
         x = left if len(series) == 1 else left + plot_width * idx / max(1, len(series) - 1)
         y = top + plot_height * (1 - ratio)
@@ -178,8 +320,8 @@ def build_line_chart(series: List[Dict[str, Any]]) -> Dict[str, Any]:
         area_points.append(f"{enriched[0]['x']},{height - bottom}")
         area_points.extend(points)
         area_points.append(f"{enriched[-1]['x']},{height - bottom}")
-    interval = max(1, len(series) // 6)
-    ticks = [item.get('label', '') if idx % interval == 0 or idx == len(series) - 1 else '' for idx, item in enumerate(series)]
+    interval = max(1, len(indices) // 6)
+    ticks = [series[idx].get('label', '') if pos % interval == 0 or pos == len(indices) - 1 else '' for pos, idx in enumerate(indices)]
     return {'width': width, 'height': height, 'points': ' '.join(points), 'area_points': ' '.join(area_points), 'points_data': enriched, 'ticks': ticks, 'max_value': format_full_number(max_value)}
 
 
@@ -220,7 +362,9 @@ def extract_live_platform_totals(all_stats: Any) -> Dict[str, int]:
     return totals
 
 
-async def collect_astrbot_dashboard_stats(context: Any, hours: int = 24) -> Dict[str, Any]:
+async def collect_astrbot_dashboard_stats(context: Any, window: str = '24h', aggregator: Any = None, token_index: Any = None, sql_pushdown: bool = False) -> Dict[str, Any]:
+    started = time.perf_counter()
+    hours, step, bar_step, label_format, bar_format = STATS_WINDOWS[stats_window(window)]
     now = datetime.datetime.now()
     start_time = now - datetime.timedelta(hours=hours)
     runtime = {'dashboard_username': 'astrbot', 'current_provider': '', 'current_model': '', 'plugin_count': 0, 'platform_count': 0, 'provider_count': 0}
@@ -266,10 +410,33 @@ async def collect_astrbot_dashboard_stats(context: Any, hours: int = 24) -> Dict
         except Exception:
             live_totals = {}
 
-    message_buckets = {bucket: 0 for bucket in build_hour_buckets(hours)}
+    stage_started, stage_before = time.perf_counter(), dict(EXTRACT_STATS)
+    message_buckets = {bucket: 0 for bucket in build_buckets(hours, step)}
     platform_ranking: Dict[str, int] = dict(live_totals)
     db = resolve_db(context)
-    if db is not None and hasattr(db, 'get_platform_stats'):
+    pushed: Dict[str, Any] = {}
+    db_path = sqlite_path(db) if sql_pushdown else None
+    if db_path:
+        pushed = await run_collector('stats_pushdown', query_dashboard_aggregates, db_path, start_time, timeout=10.0, default={}) or {}
+    if pushed.get('platform_hours') is not None:
+        # GROUP BY platform, hour ran inside SQLite; only the grouped rows come back.
+        pushed_ranking: Dict[str, int] = {}
+        for name, hour, total in pushed['platform_hours']:
+            bucket = floor_bucket(hour, step) if hour is not None else None
+            if bucket in message_buckets:
+                message_buckets[bucket] += total
+            pushed_ranking[name] = pushed_ranking.get(name, 0) + total
+        if pushed_ranking:
+            platform_ranking = {name: total for name, total in pushed_ranking.items() if total > 0}
+    elif aggregator is not None and await aggregator.refresh(db, hours):
+        # Incremental path: only rows past each platform's high-water mark were parsed.
+        for hour, total in aggregator.hour_totals(start_time):
+            bucket = floor_bucket(hour, step)
+            if bucket in message_buckets:
+                message_buckets[bucket] += total
+        if not aggregator.empty:
+            platform_ranking = aggregator.ranking(start_time)
+    elif db is not None and hasattr(db, 'get_platform_stats'):
         try:
             rows = await maybe_await(db.get_platform_stats(offset_sec=hours * 3600))
         except Exception:
@@ -286,24 +453,30 @@ async def collect_astrbot_dashboard_stats(context: Any, hours: int = 24) -> Dict
             platform_ranking = {}
             for name, series in per_platform.items():
                 series.sort(key=lambda item: item[0])
-                monotonic = sum(1 for i in range(1, len(series)) if series[i][1] >= series[i - 1][1]) >= max(1, len(series) - 2)
+                monotonic = looks_cumulative([value for _, value in series])
                 previous, total = None, 0.0
                 for ts, value in series:
                     delta = max(0.0, value - previous) if previous is not None and monotonic else value
                     previous = value
                     total += delta
-                    bucket = round_hour(ts)
+                    bucket = floor_bucket(ts, step)
                     if bucket in message_buckets:
                         message_buckets[bucket] += int(round(delta))
                 platform_ranking[name] = int(round(total if total > 0 else series[-1][1]))
 
-    message_series = [{'label': bucket.strftime('%H:%M'), 'value': int(message_buckets[bucket])} for bucket in sorted(message_buckets.keys())]
+    message_series = [{'label': bucket.strftime(label_format), 'value': int(message_buckets[bucket])} for bucket in sorted(message_buckets.keys())]
     message_total = max(sum(live_totals.values()), sum(item['value'] for item in message_series), sum(platform_ranking.values()))
     ranking_items = [{'name': name, 'value': value} for name, value in sorted(platform_ranking.items(), key=lambda item: item[1], reverse=True)[:8] if value > 0]
+    platform_profile = _stage_profile(stage_started, stage_before)
 
+    stage_started, stage_before = time.perf_counter(), dict(EXTRACT_STATS)
     conversation_rows: List[Dict[str, Any]] = []
     conversation_manager = getattr(context, 'conversation_manager', None) or getattr(context, 'conversation_mgr', None)
-    if conversation_manager is not None and hasattr(conversation_manager, 'get_filtered_conversations'):
+    if pushed.get('token_top') is not None:
+        conversation_rows = [{'name': truncate(name, 54), 'value': value, 'timestamp': timestamp} for name, value, timestamp in pushed['token_top']]
+    elif token_index is not None and await token_index.refresh(conversation_manager):
+        conversation_rows = token_index.rows(start_time)
+    elif conversation_manager is not None and hasattr(conversation_manager, 'get_filtered_conversations'):
         page, page_size = 1, 100
         while page <= 8:
             try:
@@ -328,14 +501,25 @@ async def collect_astrbot_dashboard_stats(context: Any, hours: int = 24) -> Dict
                 break
             page += 1
 
-    token_buckets = {bucket: 0 for bucket in build_hour_buckets(hours)}
-    for row in conversation_rows:
-        bucket = round_hour(row['timestamp'])
-        if bucket in token_buckets:
-            token_buckets[bucket] += int(row['value'])
-    token_series = [{'label': bucket.strftime('%H:%M'), 'value': int(token_buckets[bucket])} for bucket in sorted(token_buckets.keys())]
-    today_tokens = sum(row['value'] for row in conversation_rows)
+    token_buckets = {bucket: 0 for bucket in build_buckets(hours, bar_step)}
+    if pushed.get('token_hours') is not None:
+        for hour, total in pushed['token_hours']:
+            bucket = floor_bucket(hour, bar_step) if hour is not None else None
+            if bucket in token_buckets:
+                token_buckets[bucket] += total
+        today_tokens = pushed['token_total']
+    else:
+        for row in conversation_rows:
+            bucket = floor_bucket(row['timestamp'], bar_step)
+            if bucket in token_buckets:
+                token_buckets[bucket] += int(row['value'])
+        today_tokens = sum(row['value'] for row in conversation_rows)
+    token_series = [{'label': bucket.strftime(bar_format), 'value': int(token_buckets[bucket])} for bucket in sorted(token_buckets.keys())]
     token_top = [{'name': row['name'], 'value': format_full_number(row['value']), 'raw': row['value']} for row in sorted(conversation_rows, key=lambda item: item['value'], reverse=True)[:10]]
+    logger.debug(
+        f"Dashboard stats collected in {(time.perf_counter() - started) * 1000:.0f}ms; "
+        f"platform stats: {platform_profile}; conversations: {_stage_profile(stage_started, stage_before)}"
+    )
     return {**runtime, 'message_total': int(message_total), 'today_tokens': int(today_tokens), 'message_chart': build_line_chart(message_series), 'platform_ranking': [{'name': truncate(item['name'], 24), 'value': format_full_number(item['value']), 'raw': item['value']} for item in ranking_items], 'token_chart_bars': build_bar_chart(token_series), 'token_top': token_top}
 
 
@@ -357,18 +541,9 @@ def resolve_db(context: Any) -> Any:
 
 
 def collect_system_snapshot() -> Dict[str, Any]:
-    processor = platform.processor() or 'Unknown CPU'
-    if platform.system() == 'Linux':
-        try:
-            with open('/proc/cpuinfo', 'r', encoding='utf-8', errors='ignore') as file:
-                for line in file:
-                    if 'model name' in line:
-                        processor = line.split(':', 1)[1].strip()
-                        break
-        except Exception:
-            pass
-    memory = psutil.virtual_memory()
-    return {'cpu_percent': clamp_percent(psutil.cpu_percent(interval=0.1)), 'memory_percent': clamp_percent(memory.percent), 'memory_used_h': f'{memory.used / 1024 / 1024:.0f} MB', 'memory_total_h': f'{memory.total / 1024 / 1024 / 1024:.1f} GB', 'processor': processor, 'hostname': platform.node(), 'kernel': platform.release()}
+    # CPU and memory come from collect_system_info's single sample; only host identity is read here.
+    host = host_static()
+    return {'processor': host['processor'], 'hostname': platform.node(), 'kernel': host['kernel']}
 
 def format_duration(seconds: float) -> str:
     total = max(0, int(seconds))
@@ -382,6 +557,33 @@ def format_duration(seconds: float) -> str:
     return f'{minutes}m'
 
 
+def build_system_trends(history: Any, texts: Dict[str, str], sysinfo: Dict[str, Any], hours: float = 24) -> List[Dict[str, Any]]:
+    if history is None or len(history) < 2:
+        return []
+    seconds = hours * 3600
+    window = texts['history_window'].format(hours=format_short_number(hours))
+    mem = sysinfo.get('mem') or {}
+    up_peak = max([row['value'] for row in history.series('net_up', seconds)] + [0])
+    down_series = history.series('net_down', seconds)
+    return [
+        {'span': 4, 'title': texts['cpu_trend'], 'note': window, 'value': f"{clamp_percent(sysinfo.get('cpu_percent', 0))}%", 'chart': build_line_chart(history.series('cpu', seconds))},
+        {'span': 4, 'title': texts['memory_trend'], 'note': window, 'value': f"{clamp_percent(mem.get('percent', 0))}%", 'chart': build_line_chart(history.series('mem', seconds))},
+        {'span': 4, 'title': texts['network_trend'], 'note': f"{texts['upload']} {fmt_rate(up_peak)}", 'value': fmt_rate(max([row['value'] for row in down_series] + [0])), 'chart': build_line_chart(down_series)},
+    ]
+
+
+def build_long_trends(rows: List[Any], texts: Dict[str, str], days: int = 7) -> List[Dict[str, Any]]:
+    if len(rows) < 2:
+        return []
+    note = texts['history_days'].format(days=days)
+    cpu_series = [{'label': datetime.datetime.fromtimestamp(row[0]).strftime('%m-%d'), 'value': row[2]} for row in rows]
+    mem_series = [{'label': datetime.datetime.fromtimestamp(row[0]).strftime('%m-%d'), 'value': row[4]} for row in rows]
+    return [
+        {'span': 6, 'title': texts['cpu_trend'], 'note': note, 'value': f"{clamp_percent(max(row[3] for row in rows))}%", 'chart': build_line_chart(cpu_series)},
+        {'span': 6, 'title': texts['memory_trend'], 'note': note, 'value': f"{clamp_percent(max(row[5] for row in rows))}%", 'chart': build_line_chart(mem_series)},
+    ]
+
+
 def with_ratio(rows: List[Dict[str, Any]], key: str = 'raw') -> List[Dict[str, Any]]:
     max_value = max([int(row.get(key, 0) or 0) for row in rows] + [1])
     enriched: List[Dict[str, Any]] = []
@@ -392,27 +594,50 @@ def with_ratio(rows: List[Dict[str, Any]], key: str = 'raw') -> List[Dict[str, A
     return enriched
 
 
+def with_render_scale(render_data: Dict[str, Any], scale: int) -> Dict[str, Any]:
+    """Copy ``render_data`` with the canvas resized for another ``render_scale``."""
+    scale = max(1, int(scale))
+    return {
+        **render_data,
+        'render_scale': scale,
+        'canvas_width': render_data['page_width'] * scale + 48,
+        'canvas_height': render_data['logical_height'] * scale + 48,
+    }
+
+
+# Renders with different configs still share the metric collection they have in common.
+COLLECTION_FLIGHT = SingleFlight()
+
+
 async def build_dashboard_render_data(
     context: Any,
     cfg: Dict[str, Any],
     title: str = '',
     bg_image: str = '',
     background_fit_css: str = 'cover',
+    sampler: Any = None,
+    platform_stats: Any = None,
+    token_index: Any = None,
 ) -> Dict[str, Any]:
     locale = str(cfg.get('locale', 'zh'))
     theme = str(cfg.get('theme', 'custom_dashboard'))
     logical_width = max(960, int(cfg.get('width', 960)))
     render_scale = max(1, int(cfg.get('render_scale', 3)))
     requested_height = max(1560, int(cfg.get('height', 1760)))
-    texts = dashboard_texts(locale)
+    window = stats_window(cfg.get('stats_window', '24h'))
+    texts = dashboard_texts(locale, window)
     theme_tokens = build_theme_tokens(
         theme,
         str(cfg.get('accent_color', '#6366f1')),
         str(cfg.get('text_color', '#111827' if theme == 'light_card' else '#f8fafc')),
     )
 
-    stats = await collect_astrbot_dashboard_stats(context, hours=24)
-    sysinfo = await collect_system_info(
+    collector_timeout = float(cfg.get('collector_timeout', DEFAULT_COLLECTOR_TIMEOUT) or DEFAULT_COLLECTOR_TIMEOUT)
+    show_trend = bool(cfg.get('show_system_trend', True))
+    sql_pushdown = bool(cfg.get('stats_sql_pushdown', False))
+    store = getattr(sampler, 'store', None) if show_trend else None
+    since = (datetime.datetime.now() - datetime.timedelta(days=7)).timestamp()
+    sysinfo_args = dict(
         show_cpu=bool(cfg.get('show_cpu', True)),
         show_memory=bool(cfg.get('show_memory', True)),
         show_swap=bool(cfg.get('show_swap', True)),
@@ -425,8 +650,17 @@ async def build_dashboard_render_data(
         show_top_processes=bool(cfg.get('show_top_processes', True)),
         top_n=max(1, int(cfg.get('top_n', 8))),
         process_sort_key=str(cfg.get('process_sort_key', 'cpu')),
+        timeout=collector_timeout,
+    )
+    snapshot = sampler.latest() if sampler is not None else None
+    sysinfo_key = 'sysinfo:' + repr((sorted(sysinfo_args.items()), snapshot['time'] if snapshot else None))
+    # The DB / conversation queries and system sampling are independent: run them side by side.
+    stats, sysinfo, system, hourly_rows = await asyncio.gather(
+        COLLECTION_FLIGHT.do(f'stats:{id(context)}:{window}:{sql_pushdown}', lambda: collect_astrbot_dashboard_stats(context, window=window, aggregator=platform_stats, token_index=token_index, sql_pushdown=sql_pushdown)),
+        COLLECTION_FLIGHT.do(sysinfo_key, lambda: collect_system_info(snapshot=snapshot, **sysinfo_args)),
+        run_collector('snapshot', collect_system_snapshot, timeout=collector_timeout, default={'processor': 'Unknown CPU', 'hostname': platform.node()}),
+        run_collector('history', store.read_range, 'hour', since, timeout=collector_timeout, default=[]) if store is not None else maybe_await([]),
     )
-    system = collect_system_snapshot()
     now = datetime.datetime.now()
     uptime = format_duration(now.timestamp() - psutil.boot_time())
 
@@ -437,7 +671,7 @@ async def build_dashboard_render_data(
     summary_cards = [
         {'label': texts['platform_count'], 'value': format_full_number(stats.get('platform_count', 0)), 'note': texts['message_overview']},
         {'label': texts['message_total'], 'value': format_full_number(stats.get('message_total', 0)), 'note': texts['messages_24h']},
-        {'label': texts['today_tokens'], 'value': format_short_number(stats.get('today_tokens', 0)), 'note': texts['tokens_24h']},
+        {'label': texts['window_tokens'], 'value': format_short_number(stats.get('today_tokens', 0)), 'note': texts['tokens_24h']},
         {'label': texts['uptime'], 'value': uptime, 'note': now.strftime('%Y-%m-%d %H:%M')},
     ]
 
@@ -454,6 +688,11 @@ async def build_dashboard_render_data(
         system_metric_cards.append({'label': texts['upload'], 'value': sysinfo.get('net_sent_str', '0 B/s'), 'note': texts['network']})
         system_metric_cards.append({'label': texts['download'], 'value': sysinfo.get('net_recv_str', '0 B/s'), 'note': texts['network']})
 
+    system_trends = []
+    if show_trend:
+        system_trends = build_system_trends(getattr(sampler, 'history', None), texts, sysinfo, float(cfg.get('history_retention_hours', 24) or 24))
+        system_trends += build_long_trends(hourly_rows, texts)
+
     token_top = with_ratio(stats.get('token_top', []), 'raw')
     platform_ranking_rows = with_ratio(stats.get('platform_ranking', []), 'raw')
     info_rows = [
@@ -486,7 +725,7 @@ async def build_dashboard_render_data(
 
     logical_height = max(
         requested_height,
-        1540 + max(0, len(token_top) - 5) * 30 + max(0, len(disk_rows) - 2) * 30 + max(0, len(process_rows) - 4) * 24,
+        1540 + ((len(system_trends) + 2) // 3) * 280 + max(0, len(token_top) - 5) * 30 + max(0, len(disk_rows) - 2) * 30 + max(0, len(process_rows) - 4) * 24,
     )
 
     return {
@@ -507,6 +746,7 @@ async def build_dashboard_render_data(
         'footer_text': texts['powered'],
         'summary_cards': summary_cards,
         'system_metric_cards': system_metric_cards,
+        'system_trends': system_trends,
         'message_chart': stats.get('message_chart', build_line_chart([])),
         'message_total': format_full_number(stats.get('message_total', 0)),
         'platform_ranking_rows': platform_ranking_rows,
@@ -0,0 +1,96 @@
+import datetime
+import math
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class MetricHistory:
+    """Fixed-capacity ring buffer of system samples stored as typed array columns.
+
+    Every column is a preallocated ``array.array`` so memory use is
+    ``capacity * ROW_BYTES`` regardless of how long the bot runs
+    (24h at 5s resolution is 17280 rows, roughly 0.7 MB).
+    """
+
+    COLUMNS = (
+        ("time", "d"),
+        ("cpu", "f"),
+        ("mem", "f"),
+        ("swap", "f"),
+        ("disk", "f"),
+        ("net_up", "d"),
+        ("net_down", "d"),
+    )
+    ROW_BYTES = sum(array(code).itemsize for _, code in COLUMNS)
+
+    def __init__(self, retention_seconds: float = 86400, interval: float = 5.0):
+        self.retention_seconds = max(60.0, float(retention_seconds))
+        self.interval = max(1.0, float(interval))
+        self.capacity = max(2, int(math.ceil(self.retention_seconds / self.interval)))
+        self._cols = {name: array(code, bytes(array(code).itemsize * self.capacity)) for name, code in self.COLUMNS}
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self.ROW_BYTES * self.capacity
+
+    def append(self, ts: float, cpu: float = 0.0, mem: float = 0.0, swap: float = 0.0,
+               disk: float = 0.0, net_up: float = 0.0, net_down: float = 0.0):
+        idx = self._head
+        row = (ts, cpu, mem, swap, disk, net_up, net_down)
+        for (name, _), value in zip(self.COLUMNS, row):
+            self._cols[name][idx] = value
+        self._head = (idx + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, rows: Iterable[Tuple[float, ...]]):
+        """Bulk-load rows shaped like ``COLUMNS``, e.g. read back from a ``MetricsStore``."""
+        for row in rows:
+            self.append(*row)
+
+    def _physical(self, pos: int) -> int:
+        return (self._head - self._size + pos) % self.capacity
+
+    def window(self, seconds: Optional[float] = None, now: Optional[float] = None) -> Dict[str, List[float]]:
+        """Return the samples of the last ``seconds`` in chronological order, per column."""
+        now = time.time() if now is None else now
+        since = now - seconds if seconds else float("-inf")
+        times = self._cols["time"]
+        # Rows are appended in time order, so the window start can be bisected.
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if times[self._physical(mid)] < since:
+                lo = mid + 1
+            else:
+                hi = mid
+        picked = [self._physical(pos) for pos in range(lo, self._size)]
+        return {name: [self._cols[name][i] for i in picked] for name, _ in self.COLUMNS}
+
+    def series(self, column: str, seconds: Optional[float] = None, buckets: int = 48,
+               now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Average ``column`` into evenly spaced time buckets for charting."""
+        now = time.time() if now is None else now
+        seconds = seconds or self.retention_seconds
+        data = self.window(seconds, now)
+        buckets = max(1, int(buckets))
+        step = seconds / buckets
+        start = now - seconds
+        sums = [0.0] * buckets
+        counts = [0] * buckets
+        for ts, value in zip(data["time"], data[column]):
+            idx = min(buckets - 1, max(0, int((ts - start) / step)))
+            sums[idx] += value
+            counts[idx] += 1
+        rows = []
+        for idx in range(buckets):
+            if not counts[idx]:
+                continue
+            label = datetime.datetime.fromtimestamp(start + step * idx).strftime('%H:%M')
+            rows.append({'label': label, 'value': sums[idx] / counts[idx]})
+        return rows
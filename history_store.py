@@ -0,0 +1,202 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from astrbot.api import logger
+
+
+class MetricsStore:
+    """Append-only on-disk metric history made of fixed-size binary records.
+
+    Raw samples go to ``metrics_raw.bin``; closed hours and days are rolled up
+    into ``metrics_hourly.bin`` / ``metrics_daily.bin``. Every record starts
+    with its timestamp and files are written in time order, so a window is
+    located by bisecting the mmap and sliced without parsing any text.
+    """
+
+    # time, cpu, mem, swap, disk, net_up, net_down
+    RAW = struct.Struct("<dffffdd")
+    # bucket start, sample count, cpu avg/max, mem avg/max, swap avg, disk avg, net_up avg, net_down avg
+    ROLLUP = struct.Struct("<dIffffffdd")
+    PERIODS = {"hour": 3600, "day": 86400}
+    FILES = {"raw": "metrics_raw.bin", "hour": "metrics_hourly.bin", "day": "metrics_daily.bin"}
+    RETENTION_DAYS = {"hour": 90, "day": 3650}
+
+    def __init__(self, directory: str, raw_retention_days: float = 7):
+        self.directory = directory
+        self.raw_retention = max(1.0, float(raw_retention_days)) * 86400
+        self.paths = {kind: os.path.join(directory, name) for kind, name in self.FILES.items()}
+        self._lock = threading.Lock()
+        self._open_bucket: Dict[str, Optional[float]] = {"hour": None, "day": None}
+        for kind in self.FILES:
+            self._repair(kind)
+        last = self._last("raw")
+        self._last_time = last[0] if last is not None else 0.0
+        self._catch_up()
+
+    def _struct(self, kind: str) -> struct.Struct:
+        return self.RAW if kind == "raw" else self.ROLLUP
+
+    def _repair(self, kind: str):
+        """Drop a torn trailing record left behind by a crash mid-append."""
+        path = self.paths[kind]
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        extra = size % self._struct(kind).size
+        if extra:
+            logger.warning(f"Truncating {extra} stray bytes from {path}")
+            with open(path, "r+b") as file:
+                file.truncate(size - extra)
+
+    def _count(self, kind: str) -> int:
+        try:
+            return os.path.getsize(self.paths[kind]) // self._struct(kind).size
+        except OSError:
+            return 0
+
+    def _last(self, kind: str) -> Optional[Tuple]:
+        count = self._count(kind)
+        if not count:
+            return None
+        record = self._struct(kind)
+        with open(self.paths[kind], "rb") as file:
+            file.seek((count - 1) * record.size)
+            return record.unpack(file.read(record.size))
+
+    def _first_time(self, kind: str) -> Optional[float]:
+        if not self._count(kind):
+            return None
+        record = self._struct(kind)
+        with open(self.paths[kind], "rb") as file:
+            return record.unpack(file.read(record.size))[0]
+
+    def _write(self, kind: str, payload: bytes):
+        with open(self.paths[kind], "ab") as file:
+            file.write(payload)
+
+    def read_range(self, kind: str, start: float, end: Optional[float] = None) -> List[Tuple]:
+        """Return the records of ``kind`` whose timestamp lies in [start, end)."""
+        with self._lock:
+            return self._read_range(kind, start, end)
+
+    def _read_range(self, kind: str, start: float, end: Optional[float] = None) -> List[Tuple]:
+        count = self._count(kind)
+        if not count:
+            return []
+        record = self._struct(kind)
+        size = record.size
+        end = float("inf") if end is None else end
+        with open(self.paths[kind], "rb") as file, mmap.mmap(file.fileno(), count * size, access=mmap.ACCESS_READ) as mm:
+            def bisect(target: float) -> int:
+                lo, hi = 0, count
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if struct.unpack_from("<d", mm, mid * size)[0] < target:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+                return lo
+
+            first, last = bisect(start), bisect(end)
+            if first >= last:
+                return []
+            return list(record.iter_unpack(mm[first * size:last * size]))
+
+    def append(self, row: Tuple[float, float, float, float, float, float, float]):
+        """Append one raw sample and roll up any hour or day it closes."""
+        with self._lock:
+            if row[0] <= self._last_time:
+                return
+            self._write("raw", self.RAW.pack(*row))
+            self._last_time = row[0]
+            self._advance(row[0])
+
+    def _bucket(self, kind: str, ts: float) -> float:
+        period = self.PERIODS[kind]
+        # Align to local wall-clock boundaries so day rollups start at midnight.
+        offset = -time.localtime(ts).tm_gmtoff
+        return ts - ((ts - offset) % period)
+
+    def _advance(self, ts: float):
+        for kind in ("hour", "day"):
+            bucket = self._bucket(kind, ts)
+            opened = self._open_bucket[kind]
+            if opened is not None and bucket > opened:
+                self._close(kind, opened)
+                if kind == "hour":
+                    self._compact()
+            self._open_bucket[kind] = bucket
+
+    def _close(self, kind: str, bucket: float):
+        source = "raw" if kind == "hour" else "hour"
+        rows = self._read_range(source, bucket, bucket + self.PERIODS[kind])
+        rollup = self._rollup(bucket, rows, weighted=source != "raw")
+        if rollup is not None:
+            self._write(kind, self.ROLLUP.pack(*rollup))
+
+    @staticmethod
+    def _rollup(bucket: float, rows: List[Tuple], weighted: bool) -> Optional[Tuple]:
+        if not rows:
+            return None
+        if weighted:
+            # Rolling hours up into a day: weight each hour by its sample count.
+            total = sum(row[1] for row in rows) or 1
+
+            def avg(i):
+                return sum(row[i] * row[1] for row in rows) / total
+
+            return (bucket, total, avg(2), max(row[3] for row in rows), avg(4), max(row[5] for row in rows), avg(6), avg(7), avg(8), avg(9))
+        n = len(rows)
+
+        def mean(i):
+            return sum(row[i] for row in rows) / n
+
+        return (bucket, n, mean(1), max(row[1] for row in rows), mean(2), max(row[2] for row in rows), mean(3), mean(4), mean(5), mean(6))
+
+    def _catch_up(self):
+        """Roll up hours/days that closed while the plugin was not running."""
+        last_raw = self._last("raw")
+        first_raw = self._first_time("raw")
+        if last_raw is None or first_raw is None:
+            return
+        with self._lock:
+            for kind in ("hour", "day"):
+                period = self.PERIODS[kind]
+                current = self._bucket(kind, last_raw[0])
+                last_rollup = self._last(kind)
+                source_first = first_raw if kind == "hour" else self._first_time("hour")
+                if source_first is None:
+                    self._open_bucket[kind] = current
+                    continue
+                bucket = self._bucket(kind, source_first)
+                if last_rollup is not None:
+                    bucket = max(bucket, last_rollup[0] + period)
+                while bucket < current:
+                    self._close(kind, bucket)
+                    bucket = self._bucket(kind, bucket + period + 1)
+                self._open_bucket[kind] = current
+            self._compact()
+
+    def _compact(self):
+        """Drop records that fell out of retention by rewriting the tail atomically."""
+        now = time.time()
+        for kind in self.FILES:
+            retention = self.raw_retention if kind == "raw" else self.RETENTION_DAYS[kind] * 86400
+            cutoff = now - retention
+            first = self._first_time(kind)
+            # Only rewrite once a meaningful slice has expired to keep appends cheap.
+            if first is None or first >= cutoff - retention * 0.1:
+                continue
+            keep = self._read_range(kind, cutoff)
+            record = self._struct(kind)
+            tmp_path = self.paths[kind] + ".tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(b"".join(record.pack(*row) for row in keep))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.paths[kind])
@@ -5,18 +5,31 @@ from astrbot.api.message_components import Image
 
 import asyncio
 import datetime
+import functools
 import json
 import os
 import platform
 import psutil
 import re
 import sys
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from monitor import collect_system_info
-from dashboard_runtime import build_dashboard_render_data
+from monitor import MetricsSampler, collect_system_info, run_collector
+from dashboard_runtime import STATS_WINDOWS, build_dashboard_render_data, with_render_scale
+from history import MetricHistory
+from history_store import MetricsStore
+from render_cache import RenderCache, SingleFlight, config_fingerprint, prune_directory
+from cron import CronSchedule, parse_schedule
+from scheduler import RenderRateLimiter, TaskScheduler, next_fire, staggered_fire
+from task_store import TaskStore
+from platform_stats import PlatformStatsAggregator
+from pillow_renderer import OUTPUT_FORMATS, PILLOW_AVAILABLE, output_format, render_dashboard_image, transcode_file
+from template_registry import TemplateRegistry
+from token_usage import TokenUsageIndex
 from utils import (
     fmt_duration,
     fmt_rate,
@@ -26,6 +39,17 @@ from utils import (
     resolve_background,
 )
 
+SCHEDULER_STARTUP_DELAY = 10
+SCHEDULER_RETRY_DELAY = 60
+# Render files younger than this (plus the pre-render lead) may still be waiting to be sent.
+RENDER_FILE_GRACE = 60
+# Pillow renders and encodes run on their own threads so they never hold up the system collectors.
+RENDER_WORKERS = 2
+# A cold decode + fit of a very large wallpaper can take seconds on slow hosts.
+BACKGROUND_TIMEOUT = 30.0
+SCHEDULED_TITLE = "Scheduled Report"
+AUTO_USAGE = "例如：sysinfo_auto 60（分钟）、sysinfo_auto 0 9 * * 1-5（cron）、sysinfo_auto daily 09:00 Asia/Shanghai。输入 off 关闭。"
+
 THEME_PRESETS = {
     "custom_dashboard": {
         "page_bg": "#0f172a",
@@ -193,33 +217,115 @@ class ImgSysInfoPlugin(Star):
     def __init__(self, context: Context, config: AstrBotConfig):
         super().__init__(context)
         self.config = config
-        self.auto_tasks: Dict[str, Dict[str, Any]] = {}
-        self.last_run: Dict[str, float] = {}
-        self._load_tasks()
+        self.task_store = TaskStore(
+            os.path.join(os.path.dirname(__file__), "auto_tasks.db"),
+            legacy_path=os.path.join(os.path.dirname(__file__), "auto_tasks.json"),
+        )
+        self.auto_tasks, self.last_run = self.task_store.load()
         install_chinese_fonts()
-        asyncio.create_task(self._scheduler_loop())
+        interval = self._sampler_interval()
+        self.history = MetricHistory(retention_seconds=self._history_retention_hours() * 3600, interval=interval)
+        self.metrics_store = self._open_metrics_store()
+        self.sampler = MetricsSampler(interval=interval, history=self.history, store=self.metrics_store)
+        self.sampler.start()
+        self.render_dir = os.path.join(os.path.dirname(__file__), "renders")
+        self.render_cache = RenderCache(
+            ttl=self._float_config("render_cache_ttl", 15.0),
+            max_entries=int(self._float_config("render_cache_size", 16)),
+            on_evict=self._discard_render,
+        )
+        self.render_flight = SingleFlight()
+        self._render_pool = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="sysinfo-render")
+        self._render_slots = asyncio.Semaphore(RENDER_WORKERS)
+        # Fit the configured background file now, so the first render does not pay for the decode.
+        self._background_warmup = asyncio.create_task(self._resolve_background(merge_config(dict(self.config), None, None)))
+        self.templates = TemplateRegistry(os.path.join(os.path.dirname(__file__), "templates"))
+        self.platform_stats = PlatformStatsAggregator(os.path.join(os.path.dirname(__file__), "platform_stats.json"))
+        self.token_index = TokenUsageIndex()
+        self._cron_schedules: Dict[str, CronSchedule] = {}
+        # Scheduled reports are collected and rendered this many seconds early, then sent at the fire time.
+        self.scheduler = TaskScheduler(self._run_due_tasks, lead=self._float_config("prerender_lead", 10.0))
+        render_rate = self._float_config("auto_render_rate", 10.0)
+        self.render_limiter = RenderRateLimiter(render_rate, burst=max(1, int(render_rate // 4)))
+        # Scheduled deliveries share one global limit plus a smaller one per platform adapter.
+        self._send_slots = asyncio.Semaphore(max(1, int(self._float_config("auto_send_concurrency", 8))))
+        self._platform_send_limit = max(1, int(self._float_config("auto_send_platform_concurrency", 2)))
+        self._platform_slots: Dict[str, asyncio.Semaphore] = {}
+        now = time.time()
+        for task_id in self.auto_tasks:
+            last_run = self.last_run.get(task_id, now)
+            # Tasks that fell due while the bot was down run shortly after startup, as before.
+            self.scheduler.schedule(task_id, max(self._next_task_fire(task_id, last_run), now + SCHEDULER_STARTUP_DELAY))
+        self.scheduler.start()
+
+    def _float_config(self, key: str, default: float) -> float:
+        try:
+            return max(0.0, float(self.config.get(key, default)))
+        except (TypeError, ValueError):
+            return default
 
-    def _load_tasks(self):
+    def _sampler_interval(self) -> float:
         try:
-            path = os.path.join(os.path.dirname(__file__), "auto_tasks.json")
-            if os.path.exists(path):
-                with open(path, "r", encoding="utf-8") as file:
-                    data = json.load(file)
-                    self.auto_tasks = data.get("tasks", {})
-                    self.last_run = data.get("last_run", {})
-        except Exception as exc:
-            logger.error(f"Failed to load auto tasks: {exc}")
+            return max(1.0, float(self.config.get("sampler_interval", 5)))
+        except (TypeError, ValueError):
+            return 5.0
 
-    def _save_tasks(self):
+    def _history_retention_hours(self) -> float:
         try:
-            path = os.path.join(os.path.dirname(__file__), "auto_tasks.json")
-            with open(path, "w", encoding="utf-8") as file:
-                json.dump({"tasks": self.auto_tasks, "last_run": self.last_run}, file, indent=2, ensure_ascii=False)
-        except Exception as exc:
-            logger.error(f"Failed to save auto tasks: {exc}")
+            return max(1.0, float(self.config.get("history_retention_hours", 24)))
+        except (TypeError, ValueError):
+            return 24.0
 
-    def _reload_settings(self):
-        self._load_tasks()
+    def _open_metrics_store(self) -> Optional[MetricsStore]:
+        if not bool(self.config.get("history_persist", True)):
+            return None
+        try:
+            store = MetricsStore(os.path.dirname(__file__), raw_retention_days=float(self.config.get("history_raw_days", 7) or 7))
+            start = datetime.datetime.now().timestamp() - self.history.retention_seconds
+            self.history.extend(store.read_range("raw", start))
+            return store
+        except Exception as exc:
+            logger.error(f"Failed to open metrics history store: {exc}")
+            return None
+
+    async def terminate(self):
+        await self.scheduler.stop()
+        await self.sampler.stop()
+        self._background_warmup.cancel()
+        self._render_pool.shutdown(wait=False)
+        self.task_store.close()
+
+    def _next_task_fire(self, task_id: str, after: float) -> float:
+        task = self.auto_tasks.get(task_id, {})
+        if task.get("cron"):
+            # Calendar tasks: the next matching minute is computed once, right after each fire.
+            schedule = self._cron_schedule(task_id, task)
+            if schedule is not None:
+                return schedule.next_after(after)
+            return after + 3600.0
+        interval = self._task_interval(task_id)
+        if not bool(self.config.get("auto_stagger", True)):
+            return next_fire(after, interval)
+        # Each session gets a fixed slot inside its interval, so tasks created together do not fire together.
+        umo_key = str(self.auto_tasks.get(task_id, {}).get("umo_key") or task_id)
+        return staggered_fire(umo_key, interval, after, self._float_config("auto_jitter", 30.0))
+
+    def _cron_schedule(self, task_id: str, task: Dict[str, Any]) -> Optional[CronSchedule]:
+        schedule = self._cron_schedules.get(task_id)
+        if schedule is None:
+            try:
+                schedule = CronSchedule(task["cron"], task.get("timezone") or None)
+            except ValueError as exc:
+                logger.error(f"Invalid schedule for task {task_id}: {exc}")
+                return None
+            self._cron_schedules[task_id] = schedule
+        return schedule
+
+    def _task_interval(self, task_id: str) -> float:
+        try:
+            return max(1, int(self.auto_tasks[task_id]["interval"])) * 60.0
+        except (KeyError, TypeError, ValueError):
+            return 3600.0
 
     def _get_cfg(self, event_or_umo: Any, command_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         plugin_config = dict(self.config)
@@ -234,40 +340,183 @@ class ImgSysInfoPlugin(Star):
                 session_config = None
         return merge_config(plugin_config, session_config, command_params)
 
-    async def get_sysinfo_url(self, event_or_umo, title: str = ""):
-        cfg = self._get_cfg(event_or_umo)
-        bg_image, background_fit_css = resolve_background(
+    async def get_sysinfo_url(self, event_or_umo, title: str = "", command_params: Optional[Dict[str, Any]] = None):
+        cfg = self._get_cfg(event_or_umo, command_params)
+        cache_key = config_fingerprint(cfg, title)
+        cache_ttl = float(cfg.get("render_cache_ttl", self.render_cache.ttl) or 0)
+        cached = self.render_cache.get(cache_key, cache_ttl)
+        if cached:
+            logger.debug(f"Serving sysinfo render from cache ({cache_key[:8]})")
+            return cached
+        # Concurrent requests for the same dashboard share one collection + render.
+        return await self.render_flight.do(cache_key, lambda: self._render_sysinfo(cfg, title, cache_key, cache_ttl))
+
+    async def _resolve_background(self, cfg: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """``(image, css fit)`` for ``cfg``, or None if the background could not be prepared in time."""
+        return await self._run_render(
+            "background",
+            resolve_background,
             str(cfg.get("background_mode", "none")),
             str(cfg.get("background_url", "")),
             str(cfg.get("background_file", "")),
             bool(cfg.get("auto_background", True)),
             str(cfg.get("background_fit", "cover")),
+            self._canvas_size(cfg),
+            timeout=BACKGROUND_TIMEOUT,
         )
 
+    async def _render_sysinfo(self, cfg: Dict[str, Any], title: str, cache_key: str, cache_ttl: float) -> str:
+        background = await self._resolve_background(cfg)
+        if background is None:
+            # Render without it this once, but do not cache the result; the decode finishes in the background.
+            background, cache_ttl = ("", "cover"), 0.0
+        bg_image, background_fit_css = background
+
         render_data = await build_dashboard_render_data(
             self.context,
             cfg,
             title=title,
             bg_image=bg_image,
             background_fit_css=background_fit_css,
+            sampler=self.sampler,
+            platform_stats=self.platform_stats,
+            token_index=self.token_index,
         )
 
-        template_path = os.path.join(os.path.dirname(__file__), "templates", "apple_class.html")
+        fmt = output_format(cfg.get("output_format", "png"))
+        quality = max(1, min(100, int(cfg.get("output_quality", 85) or 85)))
+        max_bytes = int(float(cfg.get("output_max_kb", 0) or 0) * 1024)
+        target = os.path.join(self.render_dir, f"sysinfo_{cache_key[:16]}{OUTPUT_FORMATS[fmt][1]}")
+        renderer = str(cfg.get("renderer", "html")).lower()
+        if renderer == "pillow" and not PILLOW_AVAILABLE:
+            logger.warning("renderer is set to pillow but Pillow is not installed; falling back to html_render")
+            renderer = "html"
+        if renderer == "pillow":
+            url = await self._run_render(
+                "pillow_render",
+                render_dashboard_image,
+                render_data,
+                target,
+                fmt,
+                quality,
+                max_bytes,
+                timeout=30.0,
+                default="",
+            )
+        else:
+            template = self.templates.get("apple_class.html")
+            if template is None:
+                return ""
+            url = await self._html_render_output(template, render_data, target, fmt, quality, max_bytes)
+        if url and self._is_render_file(url):
+            # Titles are user input, so file names are unbounded; keep the directory to the cache size.
+            await run_collector("render_cleanup", prune_directory, self.render_dir, self.render_cache.max_entries, self._render_grace(), default=0)
+        if cache_ttl > 0:
+            self.render_cache.put(cache_key, url)
+        return url
+
+    async def _run_render(self, name: str, fn, *args, timeout: float = 30.0, default: Any = None) -> Any:
+        """Run a blocking render step on the render pool; return ``default`` on timeout or error.
+
+        A timed-out thread cannot be cancelled, so its slot is only released
+        once it really finishes; later renders wait for a slot instead of
+        queueing behind it in the pool.
+        """
+        await self._render_slots.acquire()
         try:
-            with open(template_path, "r", encoding="utf-8") as file:
-                template = file.read()
+            future = asyncio.get_running_loop().run_in_executor(self._render_pool, functools.partial(fn, *args))
+        except RuntimeError as exc:
+            self._render_slots.release()
+            logger.warning(f"Render step {name} failed: {exc}")
+            return default
+        future.add_done_callback(self._release_render_slot)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Render step {name} timed out after {timeout:g}s")
         except Exception as exc:
-            logger.error(f"Failed to load template: {exc}")
-            return ""
+            logger.warning(f"Render step {name} failed: {exc}")
+        return default
 
-        return await self.html_render(
-            template,
-            render_data,
-            options={"width": render_data["canvas_width"], "height": render_data["canvas_height"]},
-        )
+    def _release_render_slot(self, future: "asyncio.Future[Any]"):
+        self._render_slots.release()
+        if not future.cancelled():
+            future.exception()  # retrieved here so late failures after a timeout are not reported as unhandled
+
+    def _render_grace(self) -> float:
+        return RENDER_FILE_GRACE + self.scheduler.lead
+
+    def _is_render_file(self, value: str) -> bool:
+        return os.path.dirname(os.path.abspath(value)) == os.path.abspath(self.render_dir)
+
+    def _discard_render(self, value: str):
+        # Evicted cache entries take their file along, unless a send may still be using it.
+        if not self._is_render_file(value):
+            return
+        try:
+            if time.time() - os.path.getmtime(value) >= self._render_grace():
+                os.remove(value)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _canvas_size(cfg: Dict[str, Any]):
+        # Mirrors the canvas math in build_dashboard_render_data; the page may still grow taller.
+        scale = max(1, int(cfg.get("render_scale", 3)))
+        return max(960, int(cfg.get("width", 960))) * scale + 48, max(1560, int(cfg.get("height", 1760))) * scale + 48
+
+    @staticmethod
+    def _html_options(render_data: Dict[str, Any], fmt: str, quality: int) -> Dict[str, Any]:
+        options = {"width": render_data["canvas_width"], "height": render_data["canvas_height"]}
+        if fmt == "jpeg":
+            options.update(type="jpeg", quality=quality)
+        return options
+
+    async def _html_render_output(self, template: str, render_data: Dict[str, Any], target: str,
+                                  fmt: str, quality: int, max_bytes: int) -> str:
+        started = time.perf_counter()
+        if not max_bytes and fmt != "webp":
+            url = await self.html_render(template, render_data, options=self._html_options(render_data, fmt, quality))
+            path = url[7:] if url and url.startswith("file://") else url
+            size = f"{os.path.getsize(path) / 1024:.0f} KB" if path and os.path.isfile(path) else "size unknown (URL)"
+            logger.info(f"html_render {fmt} output at scale {render_data['render_scale']}: {size} in {(time.perf_counter() - started) * 1000:.0f}ms")
+            return url
+        # A byte budget or WebP needs the image locally to measure or re-encode it.
+        path = await self.html_render(template, render_data, return_url=False, options=self._html_options(render_data, fmt, quality))
+        if not path:
+            return ""
+        scale = int(render_data["render_scale"])
+        if PILLOW_AVAILABLE:
+            return await self._run_render("encode", transcode_file, path, target, fmt, quality, max_bytes, scale, timeout=30.0, default=path)
+        if fmt == "webp":
+            logger.warning("WebP output needs Pillow; sending the browser PNG instead")
+        # Without Pillow the only lever is the browser itself: render again at a lower scale.
+        while max_bytes and scale > 1 and os.path.getsize(path) > max_bytes:
+            scale -= 1
+            scaled = with_render_scale(render_data, scale)
+            path = await self.html_render(template, scaled, return_url=False, options=self._html_options(scaled, fmt, quality)) or path
+        logger.info(f"html_render output at scale {scale}: {os.path.getsize(path) / 1024:.0f} KB in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return path
+
+    @staticmethod
+    def _image_component(url: str) -> Image:
+        # The pillow renderer hands back a local file path instead of a URL.
+        if url.startswith(("http://", "https://")):
+            return Image.fromURL(url)
+        return Image.fromFileSystem(url[7:] if url.startswith("file://") else url)
+
+    @staticmethod
+    def _split_window(args: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Pull a stats window token (1h/24h/7d/30d) out of the command arguments."""
+        words = str(args or "").split()
+        window = next((word.lower() for word in words if word.lower() in STATS_WINDOWS), None)
+        if window is None:
+            return str(args or "").strip(), None
+        return " ".join(word for word in words if word.lower() != window), {"stats_window": window}
 
     async def _handle_sysinfo(self, event: AstrMessageEvent, title: str = ""):
-        url = await self.get_sysinfo_url(event, title)
+        title, command_params = self._split_window(title)
+        url = await self.get_sysinfo_url(event, title, command_params)
         if url:
             yield event.image_result(url)
         else:
@@ -288,7 +537,9 @@ class ImgSysInfoPlugin(Star):
 
     @filter.command("sysinfo_auto")
     async def sysinfo_auto(self, event: AstrMessageEvent, interval: str = ""):
-        async for result in self._handle_sysinfo_auto(event, interval):
+        # The command parser hands over only the first word; cron expressions need the whole argument.
+        match = re.match(r"^[\/!！\.]?sysinfo_auto\s+(.+)$", event.message_str.strip())
+        async for result in self._handle_sysinfo_auto(event, match.group(1) if match else interval):
             yield result
 
     @filter.regex(r"^[\/!！\.]?自动系统状态(?:\s+(.*))?$")
@@ -301,10 +552,9 @@ class ImgSysInfoPlugin(Star):
 
     async def _handle_sysinfo_auto(self, event: AstrMessageEvent, interval: str = ""):
         if not interval:
-            yield event.plain_result("请提供间隔分钟数，例如：sysinfo_auto 60。输入 off 关闭。")
+            yield event.plain_result("请提供间隔分钟数或发送计划，" + AUTO_USAGE)
             return
 
-        self._reload_settings()
         umo = event.unified_msg_origin
         try:
             if hasattr(umo, "to_dict"):
@@ -321,66 +571,130 @@ class ImgSysInfoPlugin(Star):
             for key in keys_to_remove:
                 del self.auto_tasks[key]
                 self.last_run.pop(key, None)
-            self._save_tasks()
+                self._cron_schedules.pop(key, None)
+                self.scheduler.cancel(key)
+            self.task_store.delete(keys_to_remove)
             yield event.plain_result("已关闭当前会话的自动发送。")
             return
 
+        interval = interval.strip()
+        schedule = None
         try:
             minutes = int(interval)
-            if minutes < 1:
-                yield event.plain_result("间隔必须大于等于 1 分钟。")
+        except ValueError:
+            try:
+                schedule = parse_schedule(interval)
+                schedule.next_after(time.time())
+            except ValueError as exc:
+                yield event.plain_result(f"无法识别的发送计划：{exc}。" + AUTO_USAGE)
                 return
+        if schedule is None and minutes < 1:
+            yield event.plain_result("间隔必须大于等于 1 分钟。")
+            return
 
-            task_id = f"{umo_key}_{datetime.datetime.now().timestamp()}"
-            self.auto_tasks[task_id] = {
-                "interval": minutes,
-                "umo_dict": umo_dict,
-                "umo_key": umo_key,
-                "created_at": datetime.datetime.now().timestamp(),
-                "enabled": True,
-            }
-            self.last_run[task_id] = datetime.datetime.now().timestamp()
-            self._save_tasks()
-
-            url = await self.get_sysinfo_url(event, "Test Report")
-            if url:
-                yield event.image_result(url)
+        task_id = f"{umo_key}_{datetime.datetime.now().timestamp()}"
+        task: Dict[str, Any] = {
+            "umo_dict": umo_dict,
+            "umo_key": umo_key,
+            "created_at": datetime.datetime.now().timestamp(),
+            "enabled": True,
+        }
+        if schedule is None:
+            task["interval"] = minutes
+        else:
+            task.update({"cron": schedule.expression, "timezone": schedule.timezone})
+            self._cron_schedules[task_id] = schedule
+        self.auto_tasks[task_id] = task
+        self.last_run[task_id] = datetime.datetime.now().timestamp()
+        self.task_store.upsert(task_id, task, self.last_run[task_id])
+        upcoming = self._next_task_fire(task_id, self.last_run[task_id])
+        self.scheduler.schedule(task_id, upcoming)
+
+        url = await self.get_sysinfo_url(event, "Test Report")
+        if url:
+            yield event.image_result(url)
+            if schedule is None:
                 yield event.plain_result(f"✅ 已开启自动发送，每 {minutes} 分钟发送一次。")
             else:
-                yield event.plain_result("❌ 测试发送失败，请检查日志。")
-        except ValueError:
-            yield event.plain_result("请输入有效的分钟数。")
-
-    async def _scheduler_loop(self):
-        logger.info("Sysinfo scheduler started")
-        await asyncio.sleep(10)
-        while True:
+                next_text = datetime.datetime.fromtimestamp(upcoming, schedule.tz).strftime("%Y-%m-%d %H:%M %Z").strip()
+                yield event.plain_result(f"✅ 已开启自动发送，计划 {schedule}，下次发送 {next_text}。")
+        else:
+            yield event.plain_result("❌ 测试发送失败，请检查日志。")
+
+    async def _run_due_tasks(self, due):
+        from astrbot.core.platform.sources.unified_message_origin import UnifiedMessageOrigin
+
+        # Sessions whose effective config matches see the same dashboard: render it once per group.
+        groups: Dict[str, List[Tuple[str, Any, float, float]]] = {}
+        for key, fire_at in due:
+            task = self.auto_tasks.get(key)
+            if task is None:
+                continue
+            # Anchor the next run to the planned fire time so render time does not accumulate as drift.
+            upcoming = self._next_task_fire(key, fire_at)
+            self.scheduler.schedule(key, upcoming)
             try:
-                self._load_tasks()
-                now = datetime.datetime.now().timestamp()
-                if not self.auto_tasks:
-                    await asyncio.sleep(60)
-                    continue
-
-                for key, task in list(self.auto_tasks.items()):
-                    interval_sec = int(task["interval"]) * 60
-                    last_run = self.last_run.get(key, 0)
-                    if now - last_run < interval_sec:
-                        continue
-                    try:
-                        from astrbot.core.platform.sources.unified_message_origin import UnifiedMessageOrigin
-
-                        umo = UnifiedMessageOrigin(**task["umo_dict"])
-                        url = await self.get_sysinfo_url(umo, "Scheduled Report")
-                        if url:
-                            await self.context.send_message(umo, [Image.fromURL(url)])
-                            self.last_run[key] = now
-                            self._save_tasks()
-                    except Exception as exc:
-                        logger.error(f"Scheduler failed for task {key}: {exc}")
+                umo = UnifiedMessageOrigin(**task["umo_dict"])
+                fingerprint = config_fingerprint(self._get_cfg(umo), SCHEDULED_TITLE)
             except Exception as exc:
-                logger.error(f"Scheduler loop error: {exc}")
-            await asyncio.sleep(60)
+                logger.error(f"Scheduler failed for task {key}: {exc}")
+                self._retry_task(key, upcoming)
+                continue
+            groups.setdefault(fingerprint, []).append((key, umo, fire_at, upcoming))
+        if groups:
+            logger.debug(f"Scheduler: {sum(len(members) for members in groups.values())} due tasks in {len(groups)} render groups")
+        delivered = await asyncio.gather(*(self._deliver_group(members) for members in groups.values()))
+        self.task_store.mark_run({key: self.last_run[key] for keys in delivered for key in keys if key in self.auto_tasks})
+
+    async def _deliver_group(self, members: List[Tuple[str, Any, float, float]]) -> List[str]:
+        await self.render_limiter.acquire()
+        try:
+            url = await self.get_sysinfo_url(members[0][1], SCHEDULED_TITLE)
+        except Exception as exc:
+            logger.error(f"Scheduled render failed for tasks {[member[0] for member in members]}: {exc}")
+            url = None
+        if not url:
+            for key, _, _, upcoming in members:
+                self._retry_task(key, upcoming)
+            return []
+        image = self._image_component(url)
+        sent = await asyncio.gather(*(self._send_scheduled(key, umo, image, fire_at) for key, umo, fire_at, _ in members))
+        for (key, _, _, upcoming), ok in zip(members, sent):
+            if ok:
+                self.last_run[key] = time.time()
+            else:
+                self._retry_task(key, upcoming)
+        return [member[0] for member, ok in zip(members, sent) if ok]
+
+    async def _send_scheduled(self, key: str, umo: Any, image: Any, fire_at: float) -> bool:
+        # The image was prepared ahead of time: hold it until the deadline. An overrun is sent late, never skipped.
+        wait = fire_at - time.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        elif wait < -1:
+            logger.info(f"Scheduled report for task {key} is {-wait:.1f}s late; consider a larger prerender_lead")
+        if key not in self.auto_tasks:
+            return False
+        platform_id = str(getattr(umo, "platform_name", "") or "")
+        platform_slots = self._platform_slots.setdefault(platform_id, asyncio.Semaphore(self._platform_send_limit))
+        timeout = self._float_config("auto_send_timeout", 30.0) or None
+        # Take the platform slot first so a busy adapter does not hold global slots while it waits.
+        async with platform_slots:
+            async with self._send_slots:
+                try:
+                    await asyncio.wait_for(self.context.send_message(umo, [image]), timeout)
+                    return True
+                except asyncio.TimeoutError:
+                    logger.warning(f"Scheduled send for task {key} timed out after {timeout:g}s")
+                except Exception as exc:
+                    logger.error(f"Scheduled send for task {key} failed: {exc}")
+        return False
+
+    def _retry_task(self, key: str, upcoming: float):
+        # Failed runs are retried after a minute, like the old polling loop did.
+        retry_at = time.time() + SCHEDULER_RETRY_DELAY
+        if key in self.scheduler and retry_at < upcoming:
+            self.scheduler.schedule(key, retry_at)
 
     @filter.command("sysinfo_conf")
     async def sysinfo_conf(self, event: AstrMessageEvent):
@@ -422,5 +736,5 @@ class ImgSysInfoPlugin(Star):
 
         cfg = self._get_cfg(event)
         partitions = norm_mounts(cfg.get("disk_partitions", []))
-        disks, _, _ = list_disks(partitions)
+        disks = await run_collector("disk", lambda: list_disks(partitions)[0], default=[])
         yield event.plain_result(json.dumps(disks, ensure_ascii=False, indent=2))
@@ -2,10 +2,37 @@ import psutil
 import os
 import asyncio
 import platform
+import time
+import functools
+import heapq
+import select
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from typing import List, Dict, Tuple, Optional, Any
 from astrbot.api import logger
 from utils import fmt_bytes, fmt_rate, detect_linux_distro
 
+# Blocking psutil / filesystem collectors never run on the event loop. The pool is
+# bounded so a hung mount cannot spawn an unbounded number of stuck threads.
+COLLECTOR_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sysinfo-collector")
+DEFAULT_COLLECTOR_TIMEOUT = 3.0
+_FAILED = object()
+
+async def run_collector(name: str, fn, *args, timeout: float = DEFAULT_COLLECTOR_TIMEOUT, default: Any = None) -> Any:
+    """Run a blocking collector in ``COLLECTOR_POOL``; return ``default`` on timeout or error."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(COLLECTOR_POOL, functools.partial(fn, *args)), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Collector {name} timed out after {timeout:.1f}s")
+    except Exception as e:
+        logger.warning(f"Collector {name} failed: {e}")
+    return default
+
+async def _none(value: Any = None) -> Any:
+    return value
+
 def norm_mounts(parts_cfg: List[str]) -> List[str]:
     """Normalize mount points for different OS."""
     res = []
@@ -19,87 +46,182 @@ def norm_mounts(parts_cfg: List[str]) -> List[str]:
             res.append(p)
     return res
 
-def list_disks(parts_cfg: List[str]) -> Tuple[List[Dict], int, int]:
-    """List disk usage for specified mount points or auto-discover."""
-    disks = []
-    
-    def add_disk(mp, fstype="N/A"):
-        try:
-            du = psutil.disk_usage(mp)
-            # Check if already added
-            for d in disks:
-                if d["mount"] == mp: return
-            
-            disks.append({
-                "mount": mp,
-                "percent": int(du.percent),
-                "used_h": fmt_bytes(du.used),
-                "total_h": fmt_bytes(du.total),
-                "used_raw": du.used,
-                "total_raw": du.total,
-                "fstype": fstype,
-                "is_system": False
-            })
-        except Exception as e:
-            logger.debug(f"Failed to get disk usage for {mp}: {e}")
+class MountTable:
+    """Filtered mount list cached until the kernel reports a mount change.
 
-    if parts_cfg:
-        for mp in parts_cfg:
-            add_disk(mp)
-        t_used = sum(d["used_raw"] for d in disks)
-        t_total = sum(d["total_raw"] for d in disks)
-        return disks, t_used, t_total
+    On Linux ``/proc/self/mountinfo`` is polled for ``POLLPRI``, which the
+    kernel raises whenever the mount table changes; elsewhere the list expires
+    after ``FALLBACK_TTL``. ``disk_usage`` calls run on a small dedicated pool
+    with a timeout, and a mount that times out is quarantined with exponential
+    backoff so one dead network share cannot stall every dashboard.
+    """
 
-    ignore_fstypes = {'squashfs', 'overlay', 'tmpfs', 'devtmpfs', 'iso9660', 'tracefs', 'cgroup', 'sysfs', 'proc', 'autofs', 'fuse.sshfs'}
-    ignore_paths = {'/proc', '/sys', '/dev', '/run', '/boot', '/snap'}
-    ignore_path_prefixes = ('/var/lib/docker', '/var/lib/kubelet', '/var/lib/containers', '/run/docker', '/run/user', '/etc/')
+    FALLBACK_TTL = 60.0
+    USAGE_TIMEOUT = 2.0
+    QUARANTINE_BASE = 30.0
+    QUARANTINE_MAX = 1800.0
 
-    system_drive = None
-    if os.name == 'nt':
-        system_drive = os.environ.get('SystemDrive', 'C:') + '\\'
+    IGNORE_FSTYPES = {'squashfs', 'overlay', 'tmpfs', 'devtmpfs', 'iso9660', 'tracefs', 'cgroup', 'sysfs', 'proc', 'autofs', 'fuse.sshfs'}
+    IGNORE_PATHS = {'/proc', '/sys', '/dev', '/run', '/boot', '/snap'}
+    IGNORE_PATH_PREFIXES = ('/var/lib/docker', '/var/lib/kubelet', '/var/lib/containers', '/run/docker', '/run/user', '/etc/')
+    MIN_SIZE = 100 * 1024 * 1024
+
+    def __init__(self, mountinfo: str = "/proc/self/mountinfo"):
+        self._lock = threading.Lock()
+        self._candidates: Optional[List[Tuple[str, str, bool]]] = None
+        self._small: set = set()
+        self._loaded_at = 0.0
+        self._quarantine: Dict[str, Tuple[float, int]] = {}
+        self._inflight: Dict[str, Any] = {}
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sysinfo-statvfs")
+        self._poller = None
+        self._watch = None
+        if hasattr(select, "poll") and os.path.exists(mountinfo):
+            try:
+                self._watch = open(mountinfo, "rb")
+                self._poller = select.poll()
+                self._poller.register(self._watch, select.POLLPRI | select.POLLERR)
+                self._poller.poll(0)  # consume the initial event
+            except OSError:
+                self._poller = None
+
+    def _changed(self) -> bool:
+        if self._poller is not None:
+            try:
+                return bool(self._poller.poll(0))
+            except OSError:
+                return True
+        return time.time() - self._loaded_at > self.FALLBACK_TTL
+
+    def invalidate(self):
+        with self._lock:
+            self._candidates = None
+
+    def candidates(self) -> List[Tuple[str, str, bool]]:
+        """``(mountpoint, fstype, is_system)`` after the static filter pipeline."""
+        with self._lock:
+            if self._candidates is None or self._changed():
+                self._candidates = self._load()
+                self._small.clear()
+                self._loaded_at = time.time()
+            return self._candidates
+
+    def _load(self) -> List[Tuple[str, str, bool]]:
+        system_drive = None
+        if os.name == 'nt':
+            system_drive = os.environ.get('SystemDrive', 'C:') + '\\'
 
-    try:
         partitions = psutil.disk_partitions(all=False)
         if os.name != 'nt':
                 partitions = psutil.disk_partitions(all=True)
 
+        result = []
         seen_devices = set()
         for p in partitions:
             if p.mountpoint == '/':
                 pass
-            elif p.fstype in ignore_fstypes: continue
-            
-            if p.mountpoint in ignore_paths: continue
-            if any(p.mountpoint.startswith(prefix) for prefix in ignore_path_prefixes): continue
+            elif p.fstype in self.IGNORE_FSTYPES: continue
+
+            if p.mountpoint in self.IGNORE_PATHS: continue
+            if any(p.mountpoint.startswith(prefix) for prefix in self.IGNORE_PATH_PREFIXES): continue
             if 'ro' in p.opts and 'loop' in p.device: continue
             if p.device.startswith('/dev/'):
                 if p.device in seen_devices: continue
                 seen_devices.add(p.device)
 
             mp = p.mountpoint
-            try:
-                du = psutil.disk_usage(mp)
-                if du.total < 100 * 1024 * 1024 and mp != '/': continue
-                
-                # Check system disk
-                is_system = False
-                if os.name == 'nt':
-                     if system_drive and mp.upper().startswith(system_drive.upper()):
-                         is_system = True
-                elif mp == '/':
+            # Check system disk
+            is_system = False
+            if os.name == 'nt':
+                 if system_drive and mp.upper().startswith(system_drive.upper()):
                      is_system = True
-                
-                add_disk(mp, p.fstype)
-                if disks and disks[-1]["mount"] == mp:
-                    disks[-1]["is_system"] = is_system
-                    
-            except Exception:
-                pass
+            elif mp == '/':
+                 is_system = True
+            result.append((mp, p.fstype, is_system))
+        return result
+
+    def usage(self, mp: str) -> Optional[Any]:
+        """``psutil.disk_usage(mp)``, or None when it failed, timed out or is quarantined."""
+        now = time.time()
+        with self._lock:
+            until, strikes = self._quarantine.get(mp, (0.0, 0))
+            if now < until:
+                return None
+            pending = self._inflight.get(mp)
+            if pending is not None and not pending.done():
+                # A previous statvfs on this mount is still hung; don't pile up more.
+                return None
+            future = self._pool.submit(psutil.disk_usage, mp)
+            self._inflight[mp] = future
+        try:
+            du = future.result(timeout=self.USAGE_TIMEOUT)
+        except FutureTimeout:
+            with self._lock:
+                strikes += 1
+                backoff = min(self.QUARANTINE_MAX, self.QUARANTINE_BASE * 2 ** (strikes - 1))
+                self._quarantine[mp] = (time.time() + backoff, strikes)
+            logger.warning(f"disk_usage({mp}) timed out; quarantined for {backoff:.0f}s")
+            return None
+        except Exception as e:
+            logger.debug(f"Failed to get disk usage for {mp}: {e}")
+            return None
+        with self._lock:
+            self._inflight.pop(mp, None)
+            self._quarantine.pop(mp, None)
+        return du
+
+    def is_small(self, mp: str) -> bool:
+        return mp in self._small
+
+    def mark_small(self, mp: str):
+        self._small.add(mp)
+
+MOUNT_TABLE = MountTable()
+
+def list_disks(parts_cfg: List[str]) -> Tuple[List[Dict], int, int]:
+    """List disk usage for specified mount points or auto-discover."""
+    disks = []
+    
+    def add_disk(mp, fstype="N/A", du=None):
+        # Check if already added
+        for d in disks:
+            if d["mount"] == mp: return
+        du = du or MOUNT_TABLE.usage(mp)
+        if du is None: return
+
+        disks.append({
+            "mount": mp,
+            "percent": int(du.percent),
+            "used_h": fmt_bytes(du.used),
+            "total_h": fmt_bytes(du.total),
+            "used_raw": du.used,
+            "total_raw": du.total,
+            "fstype": fstype,
+            "is_system": False
+        })
+
+    if parts_cfg:
+        for mp in parts_cfg:
+            add_disk(mp)
+        t_used = sum(d["used_raw"] for d in disks)
+        t_total = sum(d["total_raw"] for d in disks)
+        return disks, t_used, t_total
+
+    try:
+        for mp, fstype, is_system in MOUNT_TABLE.candidates():
+            if len(disks) >= 8: break
+            if MOUNT_TABLE.is_small(mp): continue
+            du = MOUNT_TABLE.usage(mp)
+            if du is None: continue
+            if du.total < MountTable.MIN_SIZE and mp != '/':
+                MOUNT_TABLE.mark_small(mp)
+                continue
+
+            add_disk(mp, fstype, du)
+            if disks and disks[-1]["mount"] == mp:
+                disks[-1]["is_system"] = is_system
     except Exception as e:
         logger.warning(f"Error listing partitions: {e}")
-        
-    if len(disks) > 8:
-        disks = disks[:8]
 
     if not disks and os.name == "nt":
         for code in range(ord('A'), ord('Z')+1):
@@ -142,96 +264,475 @@ async def net_sample(interfaces: List[str], interval: float = 1.0) -> Tuple[int,
 
 def get_top_processes(n: int, sort_key: str = "memory") -> List[Dict]:
     """Get top N processes sorted by memory or cpu."""
-    def rss_fallback(pid):
+    try:
+        total = psutil.virtual_memory().total
+        procs = top_processes(max(1, n), (sort_key,))
+    except Exception as e:
+        logger.error(f"Error getting processes: {e}")
+        return []
+    procs.sort(key=_process_sort_key(sort_key), reverse=True)
+    return [{
+        **row,
+        "mem_h": fmt_bytes(row["mem"]),
+        "mem_percent": int(row["mem"] * 100 / total) if total else 0,
+    } for row in procs]
+
+class ProcessTable:
+    """Long-lived ``psutil.Process`` cache keyed by ``(pid, create_time)``.
+
+    Name, user and command line are read once per process lifetime and the
+    kept ``Process`` objects make ``cpu_percent()`` report usage since the
+    previous refresh, so no priming pass or sleep is needed. Exited pids are
+    evicted on every refresh; a reused pid is detected when its cumulative CPU
+    time goes backwards, and by a full ``is_running()`` sweep every
+    ``REVALIDATE_EVERY`` refreshes.
+    """
+
+    REVALIDATE_EVERY = 12
+    COLD_AFTER = 300.0
+
+    def __init__(self):
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._refreshes = 0
+        self.last_refresh = 0.0
+        self.stats = {"tracked": 0, "added": 0, "evicted": 0}
+
+    def is_cold(self) -> bool:
+        """True when CPU deltas would span too long (or nothing) to be meaningful."""
+        return time.time() - self.last_refresh > self.COLD_AFTER
+
+    def _track(self, pid: int) -> Optional[Dict[str, Any]]:
         try:
-            if os.name != "nt":
-                path = f"/proc/{pid}/status"
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                        for line in f:
-                            if line.startswith("VmRSS:"):
-                                parts = line.split()
-                                if len(parts) >= 2:
-                                    return int(float(parts[1]) * 1024)
-        except Exception: pass
-        return None
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                info = proc.as_dict(attrs=['name', 'username', 'cmdline'])
+                proc.cpu_percent()  # baseline for the next refresh
+                times = proc.cpu_times()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        name = info.get('name')
+        if not name:
+            cmd = info.get('cmdline')
+            name = os.path.basename(cmd[0]) if cmd else f"pid:{pid}"
+        entry = {
+            "key": (pid, proc.create_time()),
+            "proc": proc,
+            "name": name,
+            "username": info.get('username') or "N/A",
+            "cpu_time": times.user + times.system,
+        }
+        self._entries[pid] = entry
+        self.stats["added"] += 1
+        return entry
 
-    procs = []
-    try:
-        # Initial iteration to grab objects
-        candidates = []
-        for p in psutil.process_iter(attrs=["pid", "name", "username", "cmdline", "cpu_percent"]):
-            candidates.append(p)
-            
-        # If sorting by CPU, we need a second sample or rely on the first one if it's been running
-        # psutil.cpu_percent() on a process needs an interval or a previous call.
-        # The first call returns 0.0.
-        # Let's do a quick sleep-and-sample if we really want accuracy, but that blocks.
-        # Ideally, we should use the one-shot if available or just accept 0 for first run.
-        # However, in main.py logic, it did a pre-heat. We'll skip pre-heat here to keep it simple 
-        # or assume caller handles pre-heat if they want strict accuracy.
-        # But wait, main.py did: p.cpu_percent() (init) -> sleep -> p.cpu_percent() (val).
-        # We can replicate that if we make this async or split it.
-        # For now, let's just do the single pass and use whatever psutil gives, 
-        # assuming the caller might have initialized psutil context or we accept 0 for new procs.
-        # Actually, let's just implement the logic:
-        
-        for p in candidates:
+    def refresh(self) -> List[Dict[str, Any]]:
+        """Return ``{pid, name, username, mem, cpu}`` rows for every live process."""
+        with self._lock:
+            pids = set(psutil.pids())
+            for pid in [pid for pid in self._entries if pid not in pids]:
+                del self._entries[pid]
+                self.stats["evicted"] += 1
+            revalidate = self._refreshes % self.REVALIDATE_EVERY == 0
+            self._refreshes += 1
+
+            rows = []
+            for pid in pids:
+                entry = self._entries.get(pid)
+                if entry is None:
+                    # First sighting only sets the CPU baseline.
+                    entry = self._track(pid)
+                    if entry is not None:
+                        try:
+                            rows.append(self._row(entry, entry["proc"].memory_info().rss, 0.0))
+                        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                            pass
+                    continue
+                proc = entry["proc"]
+                try:
+                    with proc.oneshot():
+                        cpu = proc.cpu_percent()
+                        times = proc.cpu_times()
+                        mem_rss = proc.memory_info().rss
+                    reused = times.user + times.system < entry["cpu_time"] or (revalidate and not proc.is_running())
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    self._entries.pop(pid, None)
+                    continue
+                except psutil.AccessDenied:
+                    continue
+                if reused:
+                    self._entries.pop(pid, None)
+                    self._track(pid)
+                    continue
+                entry["cpu_time"] = times.user + times.system
+                rows.append(self._row(entry, mem_rss, cpu))
+
+            self.stats["tracked"] = len(self._entries)
+            self.last_refresh = time.time()
+            return rows
+
+    @staticmethod
+    def _row(entry: Dict[str, Any], mem_rss: int, cpu: float) -> Dict[str, Any]:
+        return {
+            "pid": entry["key"][0],
+            "name": entry["name"],
+            "username": entry["username"],
+            "mem": mem_rss,
+            "cpu": cpu,
+        }
+
+PROCESS_TABLE = ProcessTable()
+# The sampler keeps this many rows per sort order, enough for any dashboard top_n.
+MAX_TOP_PROCESSES = 32
+
+class ProcfsScanner:
+    """Linux fast path for top-process collection.
+
+    One pass reads only ``/proc/[pid]/stat``, which already carries CPU ticks,
+    start time and resident pages, keyed by ``(pid, starttime)`` so CPU deltas
+    never mix two processes that shared a pid. The top N are picked with a heap
+    and only those survivors pay for ``cmdline`` and the uid lookup.
+    """
+
+    COLD_AFTER = 300.0
+
+    def __init__(self, root: str = "/proc"):
+        self.root = root
+        self.available = sys.platform.startswith("linux") and os.path.isdir(os.path.join(root, "self"))
+        self.clk_tck = os.sysconf("SC_CLK_TCK") if self.available else 100
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if self.available else 4096
+        self._prev: Dict[Tuple[int, int], int] = {}
+        self._prev_time = 0.0
+        self._labels: Dict[Tuple[int, int], Tuple[str, str]] = {}
+        self._users: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def is_cold(self) -> bool:
+        return time.time() - self._prev_time > self.COLD_AFTER
+
+    def _scan(self) -> List[Tuple[int, int, str, int, int]]:
+        """Return ``(pid, starttime, comm, cpu_ticks, rss_bytes)`` for every readable pid."""
+        rows = []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f"{self.root}/{entry.name}/stat", "rb") as f:
+                        raw = f.read()
+                except OSError:
+                    continue
+                # comm may contain spaces and parentheses; it ends at the last ')'.
+                lpar, rpar = raw.find(b"("), raw.rfind(b")")
+                fields = raw[rpar + 2:].split()
+                if lpar < 0 or len(fields) < 22:
+                    continue
+                rows.append((
+                    int(entry.name),
+                    int(fields[19]),
+                    raw[lpar + 1:rpar].decode("utf-8", "replace"),
+                    int(fields[11]) + int(fields[12]),
+                    int(fields[21]) * self.page_size,
+                ))
+        return rows
+
+    def _username(self, pid: int) -> str:
+        try:
+            uid = os.stat(f"{self.root}/{pid}").st_uid
+        except OSError:
+            return "N/A"
+        if uid not in self._users:
+            try:
+                import pwd
+                self._users[uid] = pwd.getpwuid(uid).pw_name
+            except (ImportError, KeyError):
+                self._users[uid] = str(uid)
+        return self._users[uid]
+
+    def _label(self, pid: int, comm: str) -> Tuple[str, str]:
+        name = comm
+        if len(comm) >= 15:
+            # comm is truncated to 15 bytes; recover the full name from argv[0] like psutil does.
             try:
-                # If we want accurate CPU, we need to wait. But we can't wait per process.
-                # The best way in a synchronous function without delay is to use the cached value 
-                # or accept that the first call is 0.
-                # However, since this function is called after a 1s sleep in main logic usually,
-                # we can try to call cpu_percent(interval=None) again if it was called before.
-                
-                # To make this robust:
-                cpu = 0
+                with open(f"{self.root}/{pid}/cmdline", "rb") as f:
+                    argv0 = f.read().split(b"\0", 1)[0].decode("utf-8", "replace")
+                base = os.path.basename(argv0)
+                if base.startswith(comm):
+                    name = base
+            except OSError:
+                pass
+        return name, self._username(pid)
+
+    def top(self, n: int, sort_keys: Tuple[str, ...] = ("cpu",)) -> List[Dict[str, Any]]:
+        """Union of the top ``n`` rows for each sort key, with CPU % since the previous scan."""
+        with self._lock:
+            now = time.time()
+            scanned = self._scan()
+            elapsed = now - self._prev_time
+            prev = self._prev
+            rows = []
+            current = {}
+            for pid, start, comm, ticks, rss in scanned:
+                key = (pid, start)
+                current[key] = ticks
+                before = prev.get(key)
+                cpu = (ticks - before) / self.clk_tck / elapsed * 100 if before is not None and elapsed > 0 else 0.0
+                rows.append({"key": key, "pid": pid, "comm": comm, "mem": rss, "cpu": round(max(0.0, cpu), 1)})
+            self._prev, self._prev_time = current, now
+
+            picked: Dict[Tuple[int, int], Dict[str, Any]] = {}
+            for sort_key in sort_keys:
+                for row in heapq.nlargest(max(1, n), rows, key=_process_sort_key(sort_key)):
+                    picked[row["key"]] = row
+
+            labels = {}
+            result = []
+            for key, row in picked.items():
+                label = self._labels.get(key) or self._label(row["pid"], row["comm"])
+                labels[key] = label
+                result.append({"pid": row["pid"], "name": label[0], "username": label[1], "mem": row["mem"], "cpu": row["cpu"]})
+            self._labels = labels
+            return result
+
+PROCFS_SCANNER = ProcfsScanner()
+
+def _process_sort_key(sort_key: str):
+    if sort_key == "cpu":
+        return lambda x: (x["cpu"], x["mem"])
+    return lambda x: (x["mem"], x["cpu"])
+
+def processes_cold() -> bool:
+    if PROCFS_SCANNER.available:
+        return PROCFS_SCANNER.is_cold()
+    return PROCESS_TABLE.is_cold()
+
+def top_processes(n: int, sort_keys: Tuple[str, ...] = ("cpu",), table: Optional[ProcessTable] = None) -> List[Dict[str, Any]]:
+    """Top ``n`` ``{pid, name, username, mem, cpu}`` rows per sort key.
+
+    Uses the /proc scanner on Linux and the portable psutil ``ProcessTable``
+    everywhere else.
+    """
+    if PROCFS_SCANNER.available:
+        try:
+            return PROCFS_SCANNER.top(n, sort_keys)
+        except OSError as e:
+            logger.debug(f"/proc scan failed, falling back to psutil: {e}")
+    rows = (table or PROCESS_TABLE).refresh()
+    picked = {}
+    for sort_key in sort_keys:
+        for row in heapq.nlargest(max(1, n), rows, key=_process_sort_key(sort_key)):
+            picked[row["pid"]] = row
+    return list(picked.values())
+
+def _cpu_totals() -> Tuple[float, float]:
+    """Return (busy, total) CPU seconds, mirroring psutil's own accounting."""
+    times = psutil.cpu_times()
+    total = sum(times)
+    # guest time is already counted in user / nice on Linux
+    total -= getattr(times, "guest", 0.0) + getattr(times, "guest_nice", 0.0)
+    idle = times.idle + getattr(times, "iowait", 0.0)
+    return total - idle, total
+
+class MetricsSampler:
+    """Keep CPU, memory, swap, network and process counters warm in the background.
+
+    The sampler owns its own CPU and network baselines, so readers get rates over
+    the last interval instantly instead of paying a sampling window per request.
+    """
+
+    DISK_REFRESH_SECONDS = 60.0
+
+    def __init__(self, interval: float = 5.0, history: Any = None, store: Any = None, processes: Optional[ProcessTable] = None):
+        self.interval = max(1.0, float(interval))
+        self.processes = processes or PROCESS_TABLE
+        self.history = history
+        self.store = store
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._prev_cpu: Optional[Tuple[float, float]] = None
+        self._prev_net: Optional[Dict[str, Any]] = None
+        self._prev_time = 0.0
+        self._disk_percent = 0.0
+        self._disk_time = 0.0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Latest snapshot, or None when the sampler is not running or has stalled."""
+        snapshot = self._snapshot
+        if snapshot is None or time.time() - snapshot["time"] > self.interval * 3:
+            return None
+        return snapshot
+
+    async def _run(self):
+        # The first pass only primes baselines; the second one yields real rates.
+        loop = asyncio.get_running_loop()
+        pending = None
+        first = True
+        while True:
+            # A sample stuck on a hung mount keeps its pool thread; never stack more on top.
+            if pending is None or pending.done():
+                pending = loop.run_in_executor(COLLECTOR_POOL, self.sample)
+                pending.add_done_callback(self._collect_result)
                 try:
-                    # This returns 0.0 immediately if it's the first call.
-                    cpu = p.cpu_percent(interval=None)
-                except: pass
+                    await asyncio.wait_for(asyncio.shield(pending), self.interval * 2)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Metrics sampling exceeded {self.interval * 2:.0f}s")
+                except Exception as e:
+                    logger.warning(f"Metrics sampling failed: {e}")
+            await asyncio.sleep(min(1.0, self.interval) if first else self.interval)
+            first = False
+
+    @staticmethod
+    def _collect_result(future: "asyncio.Future[Any]"):
+        if not future.cancelled():
+            future.exception()  # retrieved here so a sample failing after its timeout is not reported as unhandled
+
+    def sample(self) -> Optional[Dict[str, Any]]:
+        """Take one sample; returns the new snapshot once baselines exist."""
+        now = time.time()
+        cpu_now = _cpu_totals()
+        try:
+            net_now = psutil.net_io_counters(pernic=True)
+        except Exception:
+            net_now = {}
+
+        procs = top_processes(MAX_TOP_PROCESSES, ("cpu", "memory"), self.processes)
+
+        prev_cpu, prev_net, elapsed = self._prev_cpu, self._prev_net, now - self._prev_time
+        self._prev_cpu, self._prev_net, self._prev_time = cpu_now, net_now, now
+        if prev_cpu is None or prev_net is None or elapsed <= 0:
+            return None
 
-                pid = p.info.get("pid")
-                name = p.info.get("name")
-                if not name:
-                    cmd = p.info.get("cmdline") or []
-                    if isinstance(cmd, list) and len(cmd) > 0:
-                        name = os.path.basename(cmd[0])
-                    else:
-                        name = f"pid:{pid}"
-                
-                mem = None
+        busy_delta = cpu_now[0] - prev_cpu[0]
+        total_delta = cpu_now[1] - prev_cpu[1]
+        cpu_percent = round(max(0.0, min(100.0, busy_delta * 100 / total_delta)), 1) if total_delta > 0 else 0.0
+
+        net = {}
+        for n, counters in net_now.items():
+            if n in prev_net:
+                up = max(0, counters.bytes_sent - prev_net[n].bytes_sent) / elapsed
+                down = max(0, counters.bytes_recv - prev_net[n].bytes_recv) / elapsed
+                net[n] = (up, down)
+
+        mem = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        if self.history is not None or self.store is not None:
+            if now - self._disk_time >= self.DISK_REFRESH_SECONDS:
+                # Disk usage moves slowly; refresh it on a coarser cadence.
+                _, t_used, t_total = list_disks([])
+                self._disk_percent = t_used * 100 / t_total if t_total > 0 else 0.0
+                self._disk_time = now
+            up = sum(rate[0] for n, rate in net.items() if n != "lo")
+            down = sum(rate[1] for n, rate in net.items() if n != "lo")
+            row = (now, cpu_percent, mem.percent, swap.percent, self._disk_percent, up, down)
+            if self.history is not None:
+                self.history.append(*row)
+            if self.store is not None:
                 try:
-                    mem = p.memory_info().rss
-                except Exception:
-                    mem = rss_fallback(pid)
-                
-                if mem is None: continue
-                
-                percent = 0
+                    self.store.append(row)
+                except Exception as e:
+                    logger.warning(f"Failed to persist metrics sample: {e}")
+        self._snapshot = {
+            "time": now,
+            "cpu_percent": cpu_percent,
+            "mem": {"percent": int(mem.percent), "used_h": fmt_bytes(mem.used), "total_h": fmt_bytes(mem.total)},
+            "swap": {"percent": int(swap.percent), "used_h": fmt_bytes(swap.used), "total_h": fmt_bytes(swap.total)},
+            "net": net,
+            "procs": procs,
+        }
+        return self._snapshot
+
+_HOST_INFO: Optional[Dict[str, str]] = None
+
+def host_static() -> Dict[str, str]:
+    """Processor, kernel and distro never change while the bot runs; read them once."""
+    global _HOST_INFO
+    if _HOST_INFO is None:
+        info = {"processor": platform.processor() or "Unknown CPU", "kernel": "Unknown", "distro": "Unknown"}
+        try:
+            # Try to get more detailed CPU name on Linux
+            if platform.system() == "Linux":
                 try:
-                    percent = int(p.memory_percent())
-                except Exception: percent = 0
-
-                procs.append({
-                    "pid": pid,
-                    "name": name,
-                    "username": p.info.get("username") or "N/A",
-                    "mem": mem,
-                    "mem_h": fmt_bytes(mem),
-                    "mem_percent": percent,
-                    "cpu": cpu
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-    except Exception as e:
-        logger.error(f"Error getting processes: {e}")
-    
-    if sort_key == "cpu":
-        procs.sort(key=lambda x: x["cpu"], reverse=True)
-    else:
-        procs.sort(key=lambda x: x["mem"], reverse=True)
-    return procs[:max(1, n)]
+                    with open("/proc/cpuinfo", "r") as f:
+                        for line in f:
+                            if "model name" in line:
+                                info["processor"] = line.split(":")[1].strip()
+                                break
+                except: pass
+            info["kernel"] = platform.release()
+            info["distro"] = detect_linux_distro().title() if platform.system() == "Linux" else platform.system()
+        except Exception:
+            info["processor"] = "Unknown"
+        _HOST_INFO = info
+    return _HOST_INFO
+
+def _collect_host_info() -> Dict[str, Any]:
+    data = dict(host_static())
+    try:
+        data["load_avg"] = " / ".join([f"{x:.2f}" for x in os.getloadavg()]) if hasattr(os, "getloadavg") else "N/A"
+    except Exception:
+        data["load_avg"] = "N/A"
+    return data
+
+def _collect_memory() -> Dict[str, Any]:
+    mem = psutil.virtual_memory()
+    return {
+        "percent": int(mem.percent),
+        "used_h": fmt_bytes(mem.used),
+        "total_h": fmt_bytes(mem.total),
+    }
+
+def _collect_swap() -> Dict[str, Any]:
+    swap = psutil.swap_memory()
+    return {
+        "percent": int(swap.percent),
+        "used_h": fmt_bytes(swap.used),
+        "total_h": fmt_bytes(swap.total),
+    }
+
+def _collect_disks(disk_partitions: List[str], show_disk_total: bool) -> Tuple[List[Dict], Optional[Dict[str, Any]]]:
+    norm_parts = norm_mounts(disk_partitions)
+    d_list, t_used, t_total = list_disks(norm_parts)
+    disk_total = None
+    if t_total > 0:
+        disk_total = {
+            "percent": int(t_used * 100 / t_total),
+            "used_h": fmt_bytes(t_used),
+            "total_h": fmt_bytes(t_total),
+        }
+    elif show_disk_total:
+        # Fallback
+        try:
+            used_b = 0
+            total_b = 0
+            for p in psutil.disk_partitions(all=True):
+                du = MOUNT_TABLE.usage(p.mountpoint)
+                if du is not None:
+                    used_b += du.used
+                    total_b += du.total
+            if total_b > 0:
+                disk_total = {
+                    "percent": int(used_b * 100 / total_b),
+                    "used_h": fmt_bytes(used_b),
+                    "total_h": fmt_bytes(total_b),
+                }
+        except: pass
+    return d_list, disk_total
+
+def _net_counters() -> Dict[str, Any]:
+    return psutil.net_io_counters(pernic=True)
 
 async def collect_system_info(
     show_cpu: bool = True,
@@ -245,116 +746,83 @@ async def collect_system_info(
     show_network_per_iface: bool = False,
     show_top_processes: bool = True,
     top_n: int = 10,
-    process_sort_key: str = "cpu"
+    process_sort_key: str = "cpu",
+    snapshot: Optional[Dict[str, Any]] = None,
+    timeout: float = DEFAULT_COLLECTOR_TIMEOUT,
 ) -> Dict[str, Any]:
-    """Collect all system metrics."""
-    
-    # --- Phase 1: Initialization & Pre-heat ---
-    if show_cpu:
-        psutil.cpu_percent(interval=None)
+    """Collect all system metrics.
+
+    When a ``MetricsSampler`` snapshot is given, CPU, memory, swap, network and
+    process figures are read from it and the 1 s sampling window is skipped.
+    Every blocking collector runs in ``COLLECTOR_POOL``; collectors that time out
+    or fail are listed in ``data["partial"]`` and their fields keep empty defaults.
+    """
+    partial: List[str] = []
+
+    async def collect(name, fn, *args, default=None):
+        result = await run_collector(name, fn, *args, timeout=timeout, default=_FAILED)
+        if result is _FAILED:
+            partial.append(name)
+            return default
+        return result
 
     net_start = None
-    if show_network:
-        try:
-            net_start = psutil.net_io_counters(pernic=True)
-        except Exception: pass
+    if snapshot is None:
+        # --- Phase 1: Initialization & Pre-heat ---
+        if show_cpu:
+            psutil.cpu_percent(interval=None)
 
-    procs_list = []
-    if show_top_processes:
-        try:
-            for p in psutil.process_iter(['pid', 'name', 'username', 'cmdline']):
-                try:
-                    p.cpu_percent() # Init call
-                    procs_list.append(p)
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-        except Exception: pass
+        net_task = collect("network", _net_counters) if show_network else _none()
+        # A warm process table already holds the previous sample; only prime a cold one.
+        prime = show_top_processes and processes_cold()
+        procs_task = collect("processes", top_processes, top_n, (process_sort_key,), default=[]) if prime else _none([])
+        net_start, _ = await asyncio.gather(net_task, procs_task)
 
-    # --- Phase 2: Sampling Window ---
-    await asyncio.sleep(1.0)
+        # --- Phase 2: Sampling Window ---
+        await asyncio.sleep(1.0)
 
     # --- Phase 3: Collection ---
     data = {}
 
+    host_task = collect("host", _collect_host_info, default={})
+    mem_task = collect("memory", _collect_memory) if show_memory and snapshot is None else _none()
+    swap_task = collect("swap", _collect_swap) if show_swap and snapshot is None else _none()
+    disk_task = collect("disk", _collect_disks, disk_partitions, show_disk_total, default=([], None)) if show_disk else _none(([], None))
+    net_end_task = collect("network", _net_counters) if show_network and net_start else _none()
+    procs_read_task = collect("processes", top_processes, top_n, (process_sort_key,), default=[]) if show_top_processes and snapshot is None else _none([])
+    host, mem, swap, (disk_info, disk_total), net_end, processed_procs = await asyncio.gather(
+        host_task, mem_task, swap_task, disk_task, net_end_task, procs_read_task
+    )
+
     # Basic Info
-    try:
-        data["processor"] = platform.processor() or "Unknown CPU"
-        # Try to get more detailed CPU name on Linux
-        if platform.system() == "Linux":
-            try:
-                with open("/proc/cpuinfo", "r") as f:
-                    for line in f:
-                        if "model name" in line:
-                            data["processor"] = line.split(":")[1].strip()
-                            break
-            except: pass
-            
-        data["kernel"] = platform.release()
-        data["distro"] = detect_linux_distro().title() if platform.system() == "Linux" else platform.system()
-        data["load_avg"] = " / ".join([f"{x:.2f}" for x in os.getloadavg()]) if hasattr(os, "getloadavg") else "N/A"
-    except Exception:
-        data["processor"] = "Unknown"
-        data["kernel"] = "Unknown"
-        data["distro"] = "Unknown"
-        data["load_avg"] = "N/A"
+    data["processor"] = host.get("processor", "Unknown")
+    data["kernel"] = host.get("kernel", "Unknown")
+    data["distro"] = host.get("distro", "Unknown")
+    data["load_avg"] = host.get("load_avg", "N/A")
 
     # CPU
-    data["cpu_percent"] = psutil.cpu_percent(interval=None) if show_cpu else 0
+    if not show_cpu:
+        data["cpu_percent"] = 0
+    elif snapshot is not None:
+        data["cpu_percent"] = snapshot["cpu_percent"]
+    else:
+        data["cpu_percent"] = psutil.cpu_percent(interval=None)
 
     # Memory
-    if show_memory:
-        mem = psutil.virtual_memory()
-        data["mem"] = {
-            "percent": int(mem.percent),
-            "used_h": fmt_bytes(mem.used),
-            "total_h": fmt_bytes(mem.total),
-        }
+    if show_memory and snapshot is not None:
+        data["mem"] = dict(snapshot["mem"])
     else:
-        data["mem"] = None
+        data["mem"] = mem
 
     # Swap
-    if show_swap:
-        swap = psutil.swap_memory()
-        data["swap"] = {
-            "percent": int(swap.percent),
-            "used_h": fmt_bytes(swap.used),
-            "total_h": fmt_bytes(swap.total),
-        }
+    if show_swap and snapshot is not None:
+        data["swap"] = dict(snapshot["swap"])
     else:
-        data["swap"] = None
+        data["swap"] = swap
 
     # Disk
-    data["disk_info"] = []
-    data["disk_total"] = None
-    if show_disk:
-        norm_parts = norm_mounts(disk_partitions)
-        d_list, t_used, t_total = list_disks(norm_parts)
-        data["disk_info"] = d_list
-        
-        if t_total > 0:
-            data["disk_total"] = {
-                "percent": int(t_used * 100 / t_total),
-                "used_h": fmt_bytes(t_used),
-                "total_h": fmt_bytes(t_total),
-            }
-        elif show_disk_total:
-             # Fallback
-             try:
-                used_b = 0
-                total_b = 0
-                for p in psutil.disk_partitions(all=True):
-                    try:
-                        du = psutil.disk_usage(p.mountpoint)
-                        used_b += du.used
-                        total_b += du.total
-                    except: pass
-                if total_b > 0:
-                    data["disk_total"] = {
-                        "percent": int(used_b * 100 / total_b),
-                        "used_h": fmt_bytes(used_b),
-                        "total_h": fmt_bytes(total_b),
-                    }
-             except: pass
+    data["disk_info"] = disk_info
+    data["disk_total"] = disk_total
 
     # Network
     data["net_sent"] = 0
@@ -362,10 +830,21 @@ async def collect_system_info(
     data["net_per"] = []
     data["net_sent_str"] = "0 B/s"
     data["net_recv_str"] = "0 B/s"
-    
-    if show_network and net_start:
+
+    if show_network and snapshot is not None:
+        rates = snapshot["net"]
+        names = network_interfaces or [n for n in rates.keys() if n != "lo"]
+        for n in names:
+            if n in rates:
+                up, down = rates[n]
+                data["net_sent"] += up
+                data["net_recv"] += down
+                if show_network_per_iface:
+                    data["net_per"].append({"name": n, "up": up, "down": down})
+        data["net_sent_str"] = fmt_rate(data["net_sent"])
+        data["net_recv_str"] = fmt_rate(data["net_recv"])
+    elif show_network and net_start and net_end:
         try:
-            net_end = psutil.net_io_counters(pernic=True)
             names = network_interfaces or [n for n in net_end.keys() if n != "lo" and n in net_start]
             
             for n in names:
@@ -383,36 +862,12 @@ async def collect_system_info(
 
     # Processes
     data["top_procs"] = []
-    if show_top_processes and procs_list:
-        processed_procs = []
-        for p in procs_list:
-            try:
-                cpu = p.cpu_percent()
-                mem_info = p.memory_info()
-                mem_rss = mem_info.rss
-                
-                name = p.info.get('name')
-                if not name:
-                    cmd = p.info.get('cmdline')
-                    if cmd: name = os.path.basename(cmd[0])
-                    else: name = f"pid:{p.pid}"
-
-                processed_procs.append({
-                    "pid": p.pid,
-                    "name": name,
-                    "username": p.info.get('username') or "N/A",
-                    "mem": mem_rss,
-                    "mem_h": fmt_bytes(mem_rss),
-                    "cpu": cpu
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        
-        if process_sort_key == "cpu":
-            processed_procs.sort(key=lambda x: (x["cpu"], x["mem"]), reverse=True)
-        else:
-            processed_procs.sort(key=lambda x: (x["mem"], x["cpu"]), reverse=True)
-        
-        data["top_procs"] = processed_procs[:top_n]
+    if show_top_processes:
+        candidates = snapshot["procs"] if snapshot is not None else processed_procs
+        top = heapq.nlargest(top_n, candidates, key=_process_sort_key(process_sort_key))
+        data["top_procs"] = [{**row, "mem_h": fmt_bytes(row["mem"])} for row in top]
 
+    data["partial"] = sorted(set(partial))
+    if data["partial"]:
+        logger.warning(f"System info is partial, collectors skipped: {', '.join(data['partial'])}")
     return data
@@ -0,0 +1,493 @@
+import base64
+import functools
+import io
+import math
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from astrbot.api import logger
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = ImageDraw = ImageFont = None
+
+PILLOW_AVAILABLE = Image is not None
+
+FONT_PATHS = (
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/wqy-microhei/wqy-microhei.ttc",
+    "C:/Windows/Fonts/msyh.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+)
+BOLD_FONT_PATHS = (
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
+    "C:/Windows/Fonts/msyhbd.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+)
+
+MARGIN = 24
+GAP = 16
+SECTION_GAP = 18
+_RGBA = re.compile(r"rgba?\(([^)]*)\)")
+Color = Tuple[int, int, int, int]
+
+
+@functools.lru_cache(maxsize=64)
+def _font(size: int, bold: bool = False):
+    for path in (BOLD_FONT_PATHS if bold else ()) + FONT_PATHS:
+        if os.path.exists(path):
+            try:
+                return ImageFont.truetype(path, size)
+            except OSError:
+                continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=128)
+def _color(value: str, alpha: Optional[float] = None) -> Color:
+    """Parse the ``#hex`` / ``rgba()`` strings produced by ``build_theme_tokens``."""
+    value = str(value or "").strip()
+    match = _RGBA.fullmatch(value)
+    if match:
+        parts = [part.strip() for part in match.group(1).split(",")]
+        red, green, blue = (int(float(part)) for part in parts[:3])
+        opacity = float(parts[3]) if len(parts) > 3 else 1.0
+    else:
+        digits = value.lstrip("#")
+        if len(digits) == 3:
+            digits = "".join(ch * 2 for ch in digits)
+        try:
+            red, green, blue = (int(digits[i:i + 2], 16) for i in (0, 2, 4))
+        except ValueError:
+            red, green, blue = 0, 0, 0
+        opacity = 1.0
+    if alpha is not None:
+        opacity = alpha
+    return red, green, blue, int(round(max(0.0, min(1.0, opacity)) * 255))
+
+
+def _load_background(source: str):
+    """Open a data URI or local file background; remote URLs are not fetched."""
+    try:
+        if source.startswith("data:"):
+            return Image.open(io.BytesIO(base64.b64decode(source.split(",", 1)[1]))).convert("RGB")
+        path = source[7:] if source.startswith("file://") else source
+        if os.path.isfile(path):
+            return Image.open(path).convert("RGB")
+    except Exception as exc:
+        logger.warning(f"Failed to load background for pillow renderer: {exc}")
+    return None
+
+
+class _Painter:
+    """Draw the ``build_dashboard_render_data`` layout of ``apple_class.html`` with Pillow.
+
+    Positions are in the template's logical pixels and scaled by
+    ``render_scale`` when drawn. Layout runs once without a canvas to measure
+    the page, then again to paint it.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.scale = max(1, int(data.get("render_scale", 1) or 1))
+        self.width = max(320, int(data.get("page_width", 960) or 960))
+        self.draw = None
+        self.fg = _color(data.get("text_color", "#f8fafc"))
+        self.muted = _color(data.get("muted_text_color", "#94a3b8"))
+        self.surface = _color(data.get("surface_bg", "#111827"))
+        self.surface_alt = _color(data.get("surface_alt", "#1f2937"))
+        self.border = _color(data.get("border_color", "#334155"))
+        self.accent = _color(data.get("accent_color", "#6366f1"))
+        self.accent_soft = _color(data.get("accent_soft", "rgba(99,102,241,0.12)"))
+        self.grid_line = _color(data.get("chart_grid", "rgba(99,102,241,0.10)"))
+        self.faint = (255, 255, 255, 71)
+        self.shell = (255, 255, 255, 36)
+        self.track = (99, 102, 241, 20)
+
+    # -- primitives -------------------------------------------------------
+
+    def px(self, value: float) -> int:
+        return int(round(MARGIN + value * self.scale))
+
+    def sz(self, value: float) -> int:
+        return max(1, int(round(value * self.scale)))
+
+    def font(self, size: float, bold: bool = False):
+        return _font(self.sz(size), bold)
+
+    def text_width(self, value: Any, size: float, bold: bool = False) -> float:
+        return self.font(size, bold).getlength(str(value)) / self.scale
+
+    def fit(self, value: str, font, limit: float) -> str:
+        if font.getlength(value) <= limit:
+            return value
+        while value and font.getlength(value + "…") > limit:
+            value = value[:-1]
+        return value + "…"
+
+    def rect(self, x: float, y: float, w: float, h: float, fill: Color, radius: float = 0, outline: Optional[Color] = None):
+        if self.draw is None or w <= 0 or h <= 0:
+            return
+        self.draw.rounded_rectangle(
+            [self.px(x), self.px(y), self.px(x + w), self.px(y + h)],
+            radius=self.sz(radius), fill=fill, outline=outline, width=1 if outline else 0,
+        )
+
+    def text(self, x: float, y: float, value: Any, size: float, color: Color, bold: bool = False,
+             max_width: Optional[float] = None, align: str = "left"):
+        if self.draw is None:
+            return
+        font = self.font(size, bold)
+        value = str(value if value is not None else "")
+        if max_width is not None:
+            value = self.fit(value, font, max(0, max_width) * self.scale)
+        offset = 0.0
+        if align != "left":
+            offset = font.getlength(value) / self.scale
+            offset = offset if align == "right" else offset / 2
+        self.draw.text((self.px(x - offset), self.px(y)), value, font=font, fill=color)
+
+    def panel(self, x: float, y: float, w: float, h: float):
+        self.rect(x, y, w, h, self.surface, 22, self.border)
+
+    def progress(self, x: float, y: float, w: float, percent: float):
+        self.rect(x, y, w, 7, self.track, 4)
+        self.rect(x, y, w * max(0.0, min(100.0, float(percent))) / 100, 7, self.accent, 4)
+
+    def empty(self, x: float, y: float, w: float, label: str) -> float:
+        self.rect(x, y, w, 72, self.surface_alt, 16)
+        self.text(x + w / 2, y + 26, label, 14, self.muted, align="center", max_width=w - 36)
+        return y + 72
+
+    def span(self, columns: int) -> float:
+        column = (self.width - 11 * GAP) / 12
+        return column * columns + GAP * (columns - 1)
+
+    def measure(self, fn, *args) -> float:
+        draw, self.draw = self.draw, None
+        try:
+            return fn(*args)
+        finally:
+            self.draw = draw
+
+    # -- blocks -----------------------------------------------------------
+
+    def hero(self, y: float) -> float:
+        data, width = self.data, self.width
+        stamp = str(data.get("timestamp_text", ""))
+        pill = self.text_width(stamp, 12, True) + 28
+        self.panel(0, y, width, 140)
+        self.text(26, y + 24, data.get("layout_hint", ""), 12, self.muted, True)
+        self.text(26, y + 46, data.get("title", ""), 32, self.fg, True, max_width=width - pill - 72)
+        self.text(26, y + 92, data.get("subtitle", ""), 15, self.muted, max_width=width - pill - 72)
+        self.rect(width - 26 - pill, y + 24, pill, 34, self.surface_alt, 17, self.border)
+        self.text(width - 26 - pill + 14, y + 32, stamp, 12, self.muted, True)
+        return y + 140
+
+    def cards(self, y: float, cards: List[Dict[str, Any]]) -> float:
+        width = (self.width - 3 * GAP) / 4
+        for idx, card in enumerate(cards):
+            x, top = (idx % 4) * (width + GAP), y + (idx // 4) * (132 + GAP)
+            self.panel(x, top, width, 132)
+            self.text(x + 20, top + 18, card.get("label", ""), 12, self.muted, True, max_width=width - 40)
+            self.text(x + 20, top + 48, card.get("value", ""), 24, self.fg, True, max_width=width - 40)
+            self.text(x + 20, top + 96, card.get("note", ""), 12, self.muted, max_width=width - 40)
+        rows = max(1, math.ceil(len(cards) / 4))
+        return y + rows * 132 + (rows - 1) * GAP
+
+    def section_title(self, y: float, kicker: str, title: str) -> float:
+        self.text(4, y + 4, kicker, 12, self.muted, True)
+        self.text(4, y + 22, title, 19, self.fg, True)
+        return y + 52
+
+    def header(self, x: float, y: float, w: float, kicker: str, title: str) -> float:
+        self.text(x, y, kicker, 12, self.muted, True, max_width=w)
+        self.text(x, y + 18, title, 19, self.fg, True, max_width=w)
+        return y + 44 + GAP
+
+    def chart_head(self, x: float, y: float, w: float, title: str, kicker: str, value: str, size: float) -> float:
+        value_width = self.text_width(value, size, True)
+        self.text(x, y, title, 15, self.fg, True, max_width=w - value_width - 12)
+        self.text(x, y + 22, kicker, 12, self.muted, True, max_width=w - value_width - 12)
+        self.text(x + w, y + 2, value, size, self.fg, True, align="right")
+        return y + 52
+
+    def line_chart(self, x: float, y: float, w: float, h: float, chart: Dict[str, Any], axis: bool = False, dots: bool = False):
+        if self.draw is None:
+            return
+        view_w = float(chart.get("width", 620) or 620)
+        view_h = float(chart.get("height", 220) or 220)
+        fx, fy = w / view_w, h / view_h
+
+        def point(px: float, py: float) -> Tuple[int, int]:
+            return self.px(x + px * fx), self.px(y + py * fy)
+
+        baseline = view_h - 26
+        self.draw.line([point(18, baseline), point(view_w - 18, baseline)], fill=self.grid_line, width=self.sz(fx))
+        if axis:
+            self.draw.line([point(18, 16), point(18, baseline)], fill=self.grid_line, width=self.sz(fx))
+        points = [point(float(item["x"]), float(item["y"])) for item in chart.get("points_data") or []]
+        if len(points) >= 2:
+            base_y = point(0, baseline)[1]
+            self.draw.polygon([(points[0][0], base_y)] + points + [(points[-1][0], base_y)], fill=self.accent_soft)
+            self.draw.line(points, fill=self.accent, width=self.sz(3 * fx), joint="curve")
+        if dots:
+            radius = self.sz(3 * fx)
+            for cx, cy in points:
+                self.draw.ellipse([cx - radius, cy - radius, cx + radius, cy + radius], fill=(255, 255, 255, 255), outline=self.accent, width=self.sz(2 * fx))
+
+    def rows(self, x: float, y: float, w: float, items: Sequence[Tuple[str, str, str, Optional[float]]], empty: str) -> float:
+        if not items:
+            return self.empty(x, y, w, empty)
+        for name, value, note, percent in items:
+            height = 44 + (26 if note else 0) + (15 if percent is not None else 0)
+            self.rect(x, y, w, height, self.surface_alt, 16, self.faint)
+            value_width = self.text_width(value, 14)
+            self.text(x + 14, y + 12, name, 14, self.fg, True, max_width=w - 40 - value_width)
+            self.text(x + w - 14, y + 13, value, 14, self.muted, align="right")
+            cursor = y + 40
+            if note:
+                self.text(x + 14, cursor, note, 12, self.muted, max_width=w - 28)
+                cursor += 26
+            if percent is not None:
+                self.progress(x + 14, cursor, w - 28, percent)
+            y += height + 12
+        return y - 12
+
+    def list_panel(self, x: float, y: float, w: float, h: Optional[float], kicker: str, title: str,
+                   items: Sequence[Tuple[str, str, str, Optional[float]]], empty: str) -> float:
+        natural = self.measure(self.rows, 0, 0, w - 40, items, empty) + 100
+        self.panel(x, y, w, h or natural)
+        self.rows(x + 20, self.header(x + 20, y + 20, w - 40, kicker, title), w - 40, items, empty)
+        return natural
+
+    def meta_panel(self, x: float, y: float, w: float, h: Optional[float]) -> float:
+        rows = self.data.get("info_rows") or []
+        natural = 100 + max(0, len(rows) * 56 - 12)
+        self.panel(x, y, w, h or natural)
+        top = self.header(x + 20, y + 20, w - 40, self.data.get("basic_info", ""), self.data.get("system_status", ""))
+        inner = w - 40
+        for row in rows:
+            self.rect(x + 20, top, inner, 44, self.surface_alt, 16, self.faint)
+            label = str(row.get("label", ""))
+            label_width = min(self.text_width(label, 13), inner * 0.4)
+            self.text(x + 34, top + 13, label, 13, self.muted, max_width=inner * 0.4)
+            self.text(x + 20 + inner - 14, top + 12, row.get("value", ""), 14, self.fg, True, align="right",
+                      max_width=inner - label_width - 44)
+            top += 56
+        return natural
+
+    def message_panel(self, x: float, y: float, w: float, h: Optional[float]) -> float:
+        data = self.data
+        chart = data.get("message_chart") or {}
+        ticks = chart.get("ticks") or []
+        chart_w = w - 68
+        chart_h = chart_w * float(chart.get("height", 220) or 220) / float(chart.get("width", 620) or 620)
+        shell_h = 14 + 52 + chart_h + (20 if ticks else 0) + 14
+        natural = shell_h + 40
+        self.panel(x, y, w, h or natural)
+        self.rect(x + 20, y + 20, w - 40, shell_h, self.shell, 18, self.faint)
+        top = self.chart_head(x + 34, y + 34, chart_w, data.get("message_trend", ""), data.get("messages_24h", ""), data.get("message_total", ""), 30)
+        self.line_chart(x + 34, top, chart_w, chart_h, chart, axis=True, dots=True)
+        if ticks:
+            column = chart_w / len(ticks)
+            labelled = [idx for idx, tick in enumerate(ticks) if tick] + [len(ticks)]
+            # Blank ticks leave their column free, so a label may run up to the next one.
+            for idx, following in zip(labelled, labelled[1:]):
+                room = min((following - idx) * column, chart_w - idx * column)
+                self.text(x + 34 + idx * column, top + chart_h + 6, ticks[idx], 11, self.muted, max_width=room - 4)
+        return natural
+
+    def ranking_panel(self, x: float, y: float, w: float, h: Optional[float]) -> float:
+        items = [(str(row.get("name", "")), str(row.get("value", "")), "", row.get("ratio", 0)) for row in self.data.get("platform_ranking_rows") or []]
+        return self.list_panel(x, y, w, h, self.data.get("message_overview", ""), self.data.get("platform_ranking", ""), items, self.data.get("no_data", ""))
+
+    def token_bars_panel(self, y: float) -> float:
+        data, w = self.data, self.width
+        bars = data.get("token_chart_bars") or []
+        chart_w = w - 68
+        shell_h = 14 + 52 + (280 if bars else 72) + 14
+        self.panel(0, y, w, shell_h + 40)
+        self.rect(20, y + 20, w - 40, shell_h, self.shell, 18, self.faint)
+        top = self.chart_head(34, y + 34, chart_w, data.get("token_trend", ""), data.get("tokens_24h", ""), data.get("token_total", ""), 30)
+        if not bars:
+            self.empty(34, top, chart_w, data.get("no_data", ""))
+            return y + shell_h + 40
+        plot_h = 280 - 12 - 8 - 16
+        bar_w = (chart_w - 10 * (len(bars) - 1)) / len(bars)
+        fill = self.accent[:3] + (150,)
+        for idx, bar in enumerate(bars):
+            bx = 34 + idx * (bar_w + 10)
+            bh = max(6.0, plot_h * float(bar.get("height", 0) or 0) / 100)
+            self.rect(bx, top + 12 + plot_h - bh, bar_w, bh, fill, min(12, bar_w / 2), self.accent[:3] + (51,))
+            self.text(bx + bar_w / 2, top + 12 + plot_h + 8, bar.get("label", ""), 11, self.muted, align="center", max_width=bar_w)
+        return y + shell_h + 40
+
+    def trend_panel(self, x: float, y: float, w: float, h: Optional[float], trend: Dict[str, Any]) -> float:
+        chart = trend.get("chart") or {}
+        ticks = [tick for tick in chart.get("ticks") or [] if tick]
+        chart_w = w - 40
+        chart_h = chart_w * float(chart.get("height", 220) or 220) / float(chart.get("width", 620) or 620)
+        natural = 20 + 52 + chart_h + (20 if ticks else 0) + 20
+        self.panel(x, y, w, h or natural)
+        top = self.chart_head(x + 20, y + 20, chart_w, trend.get("title", ""), trend.get("note", ""), trend.get("value", ""), 22)
+        self.line_chart(x + 20, top, chart_w, chart_h, chart)
+        if ticks:
+            self.text(x + 20, top + chart_h + 6, ticks[0], 11, self.muted)
+            self.text(x + 20 + chart_w, top + chart_h + 6, ticks[-1], 11, self.muted, align="right")
+        return natural
+
+    def grid_row(self, y: float, blocks: List[Tuple[int, Any, tuple]]) -> float:
+        """Lay out ``(span, fn, args)`` blocks side by side, stretched to the tallest one."""
+        x, placed = 0.0, []
+        for span, fn, args in blocks:
+            width = self.span(span)
+            placed.append((x, width, fn, args))
+            x += width + GAP
+        height = max(self.measure(fn, bx, y, width, None, *args) for bx, width, fn, args in placed)
+        for bx, width, fn, args in placed:
+            fn(bx, y, width, height, *args)
+        return y + height
+
+    def layout(self) -> float:
+        data = self.data
+        y = self.hero(0) + SECTION_GAP
+        y = self.cards(y, data.get("summary_cards") or []) + SECTION_GAP
+        y = self.section_title(y, data.get("message_overview", ""), data.get("message_trend", "")) + SECTION_GAP
+        y = self.grid_row(y, [(8, self.message_panel, ()), (4, self.ranking_panel, ())]) + SECTION_GAP
+        y = self.section_title(y, data.get("model_usage", ""), data.get("token_trend", "")) + SECTION_GAP
+        y = self.token_bars_panel(y) + SECTION_GAP
+        token_items = [(str(row.get("name", "")), str(row.get("value", "")), "", row.get("ratio", 0)) for row in data.get("token_top") or []]
+        y = self.grid_row(y, [(12, self.list_panel, (data.get("model_usage", ""), data.get("recent_tokens", ""), token_items, data.get("no_data", "")))]) + SECTION_GAP
+        y = self.section_title(y, data.get("system_status", ""), data.get("basic_info", "")) + SECTION_GAP
+        y = self.cards(y, data.get("system_metric_cards") or []) + SECTION_GAP
+
+        row, used = [], 0
+        for trend in data.get("system_trends") or []:
+            span = int(trend.get("span", 4) or 4)
+            if row and used + span > 12:
+                y = self.grid_row(y, row) + SECTION_GAP
+                row, used = [], 0
+            row.append((span, self.trend_panel, (trend,)))
+            used += span
+        if row:
+            y = self.grid_row(y, row) + SECTION_GAP
+
+        disk_items = [(str(row.get("name", "")), f"{row.get('percent', 0)}%", f"{row.get('note', '')} / {row.get('value', '')}", row.get("percent", 0)) for row in data.get("disk_rows") or []]
+        process_items = [(str(row.get("name", "")), str(row.get("value", "")), str(row.get("note", "")), None) for row in data.get("process_rows") or []]
+        y = self.grid_row(y, [
+            (4, self.meta_panel, ()),
+            (4, self.list_panel, (data.get("disk", ""), data.get("disk_usage", ""), disk_items, data.get("no_partitions", ""))),
+            (4, self.list_panel, (data.get("top_processes", ""), data.get("system_status", ""), process_items, data.get("no_data", ""))),
+        ]) + SECTION_GAP
+        self.text(4, y + 4, f"{data.get('footer_text', '')} / {data.get('generated', '')} {data.get('generated_text', '')}", 12, self.muted)
+        return y + 24
+
+    def background(self, size: Tuple[int, int]):
+        top = _color(self.data.get("page_bg", "#171735"))
+        bottom = _color(self.data.get("page_bg_end", self.data.get("page_bg", "#0c1026")))
+        mask = Image.linear_gradient("L").resize(size)
+        canvas = Image.composite(Image.new("RGB", size, bottom[:3]), Image.new("RGB", size, top[:3]), mask)
+        source = str(self.data.get("bg_image") or "")
+        picture = _load_background(source) if source else None
+        if picture is None:
+            return canvas
+        fit = str(self.data.get("background_fit_css", "cover"))
+        if fit == "100% 100%":
+            picture = picture.resize(size)
+        else:
+            ratio = (max if fit == "cover" else min)(size[0] / picture.width, size[1] / picture.height)
+            picture = picture.resize((max(1, int(picture.width * ratio)), max(1, int(picture.height * ratio))))
+        canvas.paste(picture, ((size[0] - picture.width) // 2, (size[1] - picture.height) // 2))
+        return Image.alpha_composite(canvas.convert("RGBA"), Image.new("RGBA", size, (10, 13, 29, 168))).convert("RGB")
+
+    def render(self):
+        height = self.layout()
+        size = (self.width * self.scale + 2 * MARGIN, int(math.ceil(height * self.scale)) + 2 * MARGIN)
+        image = self.background(size)
+        self.draw = ImageDraw.Draw(image, "RGBA")
+        try:
+            self.layout()
+        finally:
+            self.draw = None
+        return image
+
+
+OUTPUT_FORMATS = {"png": ("PNG", ".png"), "jpeg": ("JPEG", ".jpg"), "webp": ("WEBP", ".webp")}
+
+
+def output_format(value: Any) -> str:
+    value = str(value or "png").lower()
+    value = "jpeg" if value == "jpg" else value
+    return value if value in OUTPUT_FORMATS else "png"
+
+
+def _encode(image, fmt: str, quality: int, compact: bool) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "jpeg":
+        image.convert("RGB").save(buffer, format="JPEG", quality=quality, progressive=True)
+    elif fmt == "webp":
+        image.save(buffer, format="WEBP", quality=quality, method=4)
+    else:
+        # Fast zlib level unless a byte budget makes the smaller file worth the time.
+        image.save(buffer, format="PNG", compress_level=6 if compact else 1)
+    return buffer.getvalue()
+
+
+def save_within_budget(image, path: str, fmt: str = "png", quality: int = 85, max_bytes: int = 0, scale: int = 1) -> str:
+    """Encode ``image`` to ``path``, stepping the render scale down until it fits ``max_bytes``.
+
+    ``image`` is taken to be drawn at ``scale``; lower scales are produced by
+    resampling it rather than rendering again.
+    """
+    fmt = output_format(fmt)
+    quality = max(1, min(100, int(quality)))
+    scale = max(1, int(scale))
+    width, height = image.size
+    started = time.perf_counter()
+    for step in range(scale, 0, -1):
+        frame = image if step == scale else image.resize((max(1, width * step // scale), max(1, height * step // scale)), Image.LANCZOS)
+        payload = _encode(frame, fmt, quality, compact=max_bytes > 0)
+        if not max_bytes or len(payload) <= max_bytes or step == 1:
+            break
+        logger.info(f"Render is {len(payload) / 1024:.0f} KB at scale {step}, over the {max_bytes / 1024:.0f} KB budget; stepping down")
+    if max_bytes and len(payload) > max_bytes:
+        logger.warning(f"Render is still {len(payload) / 1024:.0f} KB at scale 1, over the {max_bytes / 1024:.0f} KB budget")
+    elapsed = (time.perf_counter() - started) * 1000
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(payload)
+    os.replace(tmp_path, path)
+    logger.info(f"Encoded {fmt} {frame.width}x{frame.height} (scale {step}): {len(payload) / 1024:.0f} KB in {elapsed:.0f}ms")
+    return path
+
+
+def transcode_file(source: str, path: str, fmt: str = "png", quality: int = 85, max_bytes: int = 0, scale: int = 1) -> str:
+    """Re-encode an image rendered elsewhere (e.g. by ``html_render``) into ``path``."""
+    if not PILLOW_AVAILABLE:
+        raise RuntimeError("Pillow is not installed")
+    with Image.open(source) as image:
+        image.load()
+        return save_within_budget(image, path, fmt, quality, max_bytes, scale)
+
+
+def render_dashboard_image(data: Dict[str, Any], path: str, fmt: str = "png", quality: int = 85, max_bytes: int = 0) -> str:
+    """Render the dashboard in-process, encode it to ``path`` and return the path."""
+    if not PILLOW_AVAILABLE:
+        raise RuntimeError("Pillow is not installed")
+    started = time.perf_counter()
+    painter = _Painter(data)
+    image = painter.render()
+    logger.debug(f"Pillow render {image.width}x{image.height}: draw {(time.perf_counter() - started) * 1000:.0f}ms")
+    return save_within_budget(image, path, fmt, quality, max_bytes, painter.scale)
@@ -0,0 +1,168 @@
+import asyncio
+import datetime
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from astrbot.api import logger
+
+from dashboard_runtime import extract_datetime, extract_number, extract_value, looks_cumulative, maybe_await, round_hour
+
+TIME_FIELDS = ['stat_time', 'timestamp', 'created_at', 'time', 'updated_at']
+NAME_FIELDS = ['platform_id', 'platform_name', 'name', 'platform']
+COUNT_FIELDS = ['message_count', 'count', 'total_count', 'total_messages', 'messages', 'total']
+
+
+class PlatformStatsAggregator:
+    """Hourly message counts per platform, fed incrementally from ``db.get_platform_stats``.
+
+    Each platform keeps a high-water mark: the ``stat_time`` and value of the
+    newest row already ingested. A refresh only asks the database for rows
+    from that mark on, adds their deltas to the hour they fall in, and applies
+    the change when the newest row itself was updated in place (AstrBot bumps
+    the current hour's counter). Only the hour of the previous refresh onwards
+    is fetched again, so idle platforms do not widen the query, and older rows
+    are never revisited: closed hours stay frozen and a render reads at most
+    ``hours`` buckets. A window reaching back past ``covered`` (the oldest time
+    ingested without gaps) rebuilds the aggregate once from that far back.
+
+    Whether a platform's rows are a running counter or per-hour counts is
+    decided once, from the first batch it appears in, with the same rule as
+    the non-incremental path, and kept in its mark from then on.
+    """
+
+    def __init__(self, path: Optional[str] = None, retention_hours: int = 24 * 31):
+        self.path = path
+        self.retention = max(1, int(retention_hours)) * 3600
+        self._buckets: Dict[int, Dict[str, int]] = {}
+        self._marks: Dict[str, Dict[str, Any]] = {}
+        self._covered: Optional[float] = None
+        self._refreshed: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.rows_ingested = 0
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+            self._buckets = {int(hour): {name: int(count) for name, count in counts.items()} for hour, counts in state.get('buckets', {}).items()}
+            self._marks = {name: dict(mark) for name, mark in state.get('marks', {}).items()}
+            self._covered = state.get('covered')
+            self._refreshed = state.get('refreshed')
+        except Exception as exc:
+            logger.warning(f"Failed to load platform stats aggregate, rebuilding: {exc}")
+            self._buckets, self._marks, self._covered, self._refreshed = {}, {}, None, None
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({'buckets': self._buckets, 'marks': self._marks, 'covered': self._covered, 'refreshed': self._refreshed}, file, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as exc:
+            logger.warning(f"Failed to save platform stats aggregate: {exc}")
+
+    @property
+    def empty(self) -> bool:
+        return not self._marks
+
+    async def refresh(self, db: Any, hours: int = 24) -> bool:
+        """Pull rows from the hour of the previous refresh on; returns False if the DB has no stats API."""
+        if db is None or not hasattr(db, 'get_platform_stats'):
+            return False
+        async with self._lock:
+            now = time.time()
+            window = offset = min(self.retention, hours * 3600)
+            if self._covered is None or now - window < self._covered - 3600:
+                # Not ingested that far back yet: rebuild from the start of the requested window.
+                self._buckets, self._marks, self._covered, self._refreshed = {}, {}, now - window, None
+            elif self._marks:
+                # AstrBot only bumps the current hour's row, so rows before the hour of the
+                # previous refresh are final; marks of idle platforms do not widen the query.
+                last = self._refreshed if self._refreshed is not None else max(mark['time'] for mark in self._marks.values())
+                since = round_hour(datetime.datetime.fromtimestamp(last)).timestamp()
+                offset = min(window, max(3600, now - since + 60))
+                if now - since + 60 > window:
+                    # Down for longer than the window: rows before it were skipped, so older hours have a gap.
+                    self._covered = max(self._covered, now - window)
+            try:
+                rows = await maybe_await(db.get_platform_stats(offset_sec=int(offset)))
+            except Exception as exc:
+                logger.warning(f"get_platform_stats failed: {exc}")
+                return True
+            self._refreshed = now
+            self.ingest(rows or [], now)
+            self._save()
+        return True
+
+    def ingest(self, rows: Iterable[Any], now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        per_platform: Dict[str, List[Any]] = {}
+        for row in rows:
+            ts = extract_datetime(row, TIME_FIELDS)
+            if ts is None:
+                continue
+            name = str(extract_value(row, NAME_FIELDS, 'unknown'))
+            count = max(0.0, extract_number(row, COUNT_FIELDS, 0))
+            per_platform.setdefault(name, []).append((ts.timestamp(), count))
+        changed = False
+        for name, series in per_platform.items():
+            series.sort(key=lambda item: item[0])
+            mark = self._marks.get(name)
+            if mark is None:
+                cumulative = looks_cumulative([value for _, value in series])
+            elif 'cumulative' not in mark:
+                # Marks saved before the mode was stored: decide from their recent values once.
+                mark['cumulative'] = looks_cumulative(mark.pop('recent', None) or [mark['value']])
+            for ts, value in series:
+                if mark is not None and ts < mark['time']:
+                    continue
+                if mark is not None and ts == mark['time']:
+                    # The newest row was bumped in place: both counting modes move by the difference.
+                    delta = value - mark['value']
+                    if not delta:
+                        continue
+                elif mark is None:
+                    delta = value
+                    mark = {'time': ts, 'value': value, 'cumulative': cumulative}
+                    self._marks[name] = mark
+                else:
+                    delta = max(0.0, value - mark['value']) if mark['cumulative'] else value
+                    mark['time'] = ts
+                mark['value'] = value
+                hour = int(round_hour(datetime.datetime.fromtimestamp(ts)).timestamp())
+                bucket = self._buckets.setdefault(hour, {})
+                bucket[name] = max(0, bucket.get(name, 0) + int(round(delta)))
+                self.rows_ingested += 1
+                changed = True
+        cutoff = now - self.retention
+        if self._covered is not None and self._covered < cutoff:
+            self._covered = cutoff
+        for name in [name for name, mark in self._marks.items() if mark['time'] < cutoff]:
+            del self._marks[name]
+            changed = True
+        for hour in [hour for hour in self._buckets if hour < cutoff]:
+            del self._buckets[hour]
+            changed = True
+        return changed
+
+    def hour_totals(self, since: datetime.datetime) -> List[Tuple[datetime.datetime, int]]:
+        """``(hour, messages)`` across platforms for the hours starting at or after ``since``."""
+        start = since.timestamp()
+        return [(datetime.datetime.fromtimestamp(hour), sum(counts.values())) for hour, counts in sorted(self._buckets.items()) if hour >= start]
+
+    def ranking(self, since: datetime.datetime) -> Dict[str, int]:
+        start = since.timestamp()
+        totals: Dict[str, int] = {}
+        for hour, counts in self._buckets.items():
+            if hour < start:
+                continue
+            for name, count in counts.items():
+                totals[name] = totals.get(name, 0) + count
+        return {name: count for name, count in totals.items() if count > 0}
@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+def config_fingerprint(cfg: Dict[str, Any], title: str = "") -> str:
+    """Stable digest of an effective config plus title; equal digests render equal dashboards."""
+    payload = json.dumps({"cfg": cfg, "title": title}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def prune_directory(directory: str, keep: int, min_age: float = 0.0) -> int:
+    """Delete all but the ``keep`` newest files in ``directory``, sparing files younger than ``min_age``."""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return 0
+    files: List[Tuple[float, str]] = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            if os.path.isfile(path):
+                files.append((os.path.getmtime(path), path))
+        except OSError:
+            continue
+    files.sort(reverse=True)
+    removed = 0
+    now = time.time()
+    for mtime, path in files[max(0, keep):]:
+        if now - mtime < min_age:
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class RenderCache:
+    """Size-bounded LRU of rendered image URLs / files with a freshness window.
+
+    ``on_evict`` is called with every value that leaves the cache (expired,
+    pushed out by the LRU bound, replaced or cleared), so local render files
+    can be deleted along with their entry.
+    """
+
+    def __init__(self, ttl: float = 15.0, max_entries: int = 16, on_evict: Optional[Callable[[str], None]] = None):
+        self.ttl = max(0.0, float(ttl))
+        self.max_entries = max(1, int(max_entries))
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self, value: str):
+        if self.on_evict is not None:
+            try:
+                self.on_evict(value)
+            except Exception:
+                pass
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[str]:
+        ttl = self.ttl if ttl is None else max(0.0, float(ttl))
+        entry = self._entries.get(key)
+        if entry is None or ttl <= 0 or time.time() - entry[0] > ttl or not self._usable(entry[1]):
+            if entry is not None:
+                del self._entries[key]
+                self._evict(entry[1])
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, value: str):
+        if not value:
+            return
+        previous = self._entries.get(key)
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        if previous is not None and previous[1] != value:
+            self._evict(previous[1])
+        while len(self._entries) > self.max_entries:
+            self._evict(self._entries.popitem(last=False)[1][1])
+
+    def clear(self):
+        values = [value for _, value in self._entries.values()]
+        self._entries.clear()
+        for value in values:
+            self._evict(value)
+
+    @staticmethod
+    def _usable(value: str) -> bool:
+        # Local render outputs can be cleaned up behind our back; URLs are trusted.
+        if value.startswith(("http://", "https://", "data:")):
+            return True
+        path = value[7:] if value.startswith("file://") else value
+        return os.path.exists(path)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key onto one in-flight task.
+
+    The work runs as its own task, so a caller that gets cancelled does not
+    cancel the result the other waiters are sharing.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _task, key=key: self._inflight.pop(key, None))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import heapq
+import math
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from astrbot.api import logger
+
+
+def next_fire(previous: float, interval: float, now: Optional[float] = None) -> float:
+    """``previous + interval``, skipping whole intervals already missed so late fires do not pile up."""
+    now = time.time() if now is None else now
+    fire_at = previous + interval
+    if fire_at <= now:
+        fire_at += (int((now - fire_at) // interval) + 1) * interval
+    return fire_at
+
+
+def phase_offset(key: str, interval: float) -> float:
+    """Stable offset in ``[0, interval)`` derived from ``key``, so sessions spread over the interval."""
+    digest = hashlib.sha1(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64 * interval
+
+
+def staggered_fire(key: str, interval: float, after: float, jitter: float = 0.0) -> float:
+    """First ``k * interval + phase_offset(key)`` after ``after``, delayed by up to ``jitter`` seconds.
+
+    Jitter only ever delays and stays under a quarter interval, so the next
+    slot is still the following grid point and the average interval holds.
+    """
+    phase = phase_offset(key, interval)
+    slot = (math.floor((after - phase) / interval) + 1) * interval + phase
+    return slot + random.uniform(0, min(max(0.0, jitter), interval / 4))
+
+
+class RenderRateLimiter:
+    """Token bucket: ``per_minute`` acquisitions per minute on average, bursts up to ``burst``."""
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        self.rate = max(0.0, float(per_minute)) / 60.0
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        # Waiters queue on the lock, so tokens go out in arrival order.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class TaskScheduler:
+    """Min-heap of ``(fire_at, task_id)`` with one sleep until the earliest deadline.
+
+    Rescheduling or cancelling a task only updates ``_due``; the heap entry it
+    replaces is dropped lazily when it reaches the top. ``schedule`` wakes the
+    loop when the new deadline is earlier than the one it sleeps on. Due tasks
+    are handed to ``on_due`` as one batch in a separate asyncio task, so a slow
+    delivery never delays the next deadline. With a ``lead``, tasks are handed
+    over that many seconds before their ``fire_at`` (which is passed along
+    unchanged), so work can be prepared ahead of the deadline.
+    """
+
+    def __init__(self, on_due: Callable[[List[Tuple[str, float]]], Awaitable[None]], lead: float = 0.0):
+        self.on_due = on_due
+        self.lead = max(0.0, float(lead))
+        self._heap: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._due
+
+    def schedule(self, task_id: str, fire_at: float):
+        wake = not self._heap or fire_at < self._heap[0][0]
+        self._due[task_id] = fire_at
+        heapq.heappush(self._heap, (fire_at, task_id))
+        if wake:
+            self._wakeup.set()
+
+    def cancel(self, task_id: str):
+        self._due.pop(task_id, None)
+
+    def next_deadline(self, task_id: str) -> Optional[float]:
+        return self._due.get(task_id)
+
+    def start(self):
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        tasks = [task for task in [self._loop_task, *self._running] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._running.clear()
+
+    def _prune(self):
+        # Drop heap entries whose task was cancelled or rescheduled since they were pushed.
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def _pop_due(self, now: float) -> List[Tuple[str, float]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, task_id = heapq.heappop(self._heap)
+            if self._due.get(task_id) == fire_at:
+                del self._due[task_id]
+                due.append((task_id, fire_at))
+        return due
+
+    async def _run(self):
+        logger.info("Sysinfo scheduler started")
+        while True:
+            self._prune()
+            self._wakeup.clear()
+            # Every task shares the same lead, so heap order by fire time is also wake-up order.
+            delay = self._heap[0][0] - self.lead - time.time() if self._heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            due = self._pop_due(time.time() + self.lead)
+            if due:
+                task = asyncio.create_task(self._dispatch(due))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _dispatch(self, due: List[Tuple[str, float]]):
+        try:
+            await self.on_due(due)
+        except Exception as exc:
+            logger.error(f"Scheduler failed for tasks {[task_id for task_id, _ in due]}: {exc}")
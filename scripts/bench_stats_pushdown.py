@@ -0,0 +1,116 @@
+"""Compare the Python stats path with the SQLite GROUP BY pushdown on a local fixture.
+
+Run from the repository root inside the AstrBot environment:
+
+    python scripts/bench_stats_pushdown.py --platforms 8 --window 24h --conversations 20000
+"""
+import argparse
+import asyncio
+import datetime as dt
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard_runtime import STATS_WINDOWS, collect_astrbot_dashboard_stats  # noqa: E402
+
+
+def build_fixture(path: Path, platforms: int, hours: int, conversations: int) -> None:
+    now = dt.datetime.now()
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE platform_stats (id INTEGER PRIMARY KEY, timestamp DATETIME, platform_id TEXT, platform_type TEXT, count INTEGER)")
+    conn.execute("CREATE TABLE conversations (inner_conversation_id INTEGER PRIMARY KEY, conversation_id TEXT, platform_id TEXT, user_id TEXT, title TEXT, token_usage INTEGER, created_at DATETIME, updated_at DATETIME)")
+    rows = []
+    for hour in range(hours):
+        stamp = (now - dt.timedelta(hours=hour)).replace(minute=0, second=0, microsecond=0)
+        for idx in range(platforms):
+            rows.append((stamp.strftime("%Y-%m-%d %H:%M:%S.%f"), f"platform-{idx}", "bench", random.randint(0, 500)))
+    conn.executemany("INSERT INTO platform_stats (timestamp, platform_id, platform_type, count) VALUES (?, ?, ?, ?)", rows)
+    rows = []
+    for idx in range(conversations):
+        updated = now - dt.timedelta(seconds=random.randint(0, hours * 3600))
+        rows.append((f"cid-{idx}", "bench", f"user-{idx}", f"conversation {idx}", random.randint(0, 20000), updated.strftime("%Y-%m-%d %H:%M:%S.%f")))
+    conn.executemany("INSERT INTO conversations (conversation_id, platform_id, user_id, title, token_usage, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)", [row + (row[-1],) for row in rows])
+    conn.commit()
+    conn.close()
+
+
+class FixtureDB:
+    """Mimics the parts of AstrBot's SQLite database the dashboard uses."""
+
+    def __init__(self, path: Path):
+        self.db_path = str(path)
+
+    def get_platform_stats(self, offset_sec: int = 86400):
+        since = (dt.datetime.now() - dt.timedelta(seconds=offset_sec)).strftime("%Y-%m-%d %H:%M:%S")
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute("SELECT * FROM platform_stats WHERE timestamp >= ?", (since,))]
+        finally:
+            conn.close()
+
+
+class FixtureConversations:
+    def __init__(self, path: Path):
+        self.db_path = str(path)
+
+    def get_filtered_conversations(self, page: int = 1, page_size: int = 100, **_):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            total = conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+            rows = conn.execute("SELECT * FROM conversations ORDER BY updated_at DESC LIMIT ? OFFSET ?", (page_size, (page - 1) * page_size))
+            return [dict(row) for row in rows], total
+        finally:
+            conn.close()
+
+
+class FixtureContext:
+    def __init__(self, path: Path):
+        self.db = FixtureDB(path)
+        self.conversation_manager = FixtureConversations(path)
+
+    def get_all_stars(self):
+        return []
+
+
+async def bench(context: FixtureContext, window: str, rounds: int, pushdown: bool):
+    timings, result = [], None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = await collect_astrbot_dashboard_stats(context, window=window, sql_pushdown=pushdown)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--platforms", type=int, default=8)
+    parser.add_argument("--window", default="24h", choices=sorted(STATS_WINDOWS))
+    parser.add_argument("--conversations", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data_v4.db"
+        hours = STATS_WINDOWS[args.window][0]
+        build_fixture(path, args.platforms, hours, args.conversations)
+        context = FixtureContext(path)
+        python_ms, python_stats = asyncio.run(bench(context, args.window, args.rounds, False))
+        pushdown_ms, pushdown_stats = asyncio.run(bench(context, args.window, args.rounds, True))
+
+    print(f"fixture: {args.platforms} platforms x {args.window}, {args.conversations} conversations")
+    print(f"python path : {python_ms:8.1f} ms  today_tokens={python_stats['today_tokens']}")
+    print(f"sql pushdown: {pushdown_ms:8.1f} ms  today_tokens={pushdown_stats['today_tokens']}")
+    print(f"message_total python={python_stats['message_total']} pushdown={pushdown_stats['message_total']}")
+    print("note: the Python path only pages the 800 most recent conversations, so its token totals can be lower.")
+
+
+if __name__ == "__main__":
+    main()
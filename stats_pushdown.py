@@ -0,0 +1,130 @@
+import datetime
+import os
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from astrbot.api import logger
+
+# Same candidate names the Python path feeds to extract_value, in the same order.
+TIME_COLUMNS = ('stat_time', 'timestamp', 'created_at', 'time', 'updated_at')
+PLATFORM_COLUMNS = ('platform_id', 'platform_name', 'name', 'platform')
+COUNT_COLUMNS = ('message_count', 'count', 'total_count', 'total_messages', 'messages', 'total')
+UPDATED_COLUMNS = ('updated_at', 'created_at', 'timestamp')
+TOKEN_COLUMNS = ('token_usage', 'tokens', 'total_tokens')
+LABEL_COLUMNS = ('title', 'conversation_id', 'user_id')
+PLATFORM_TABLES = ('platform_stats', 'platform_stat')
+CONVERSATION_TABLES = ('conversations', 'conversation_v2', 'conversation')
+# Text datetimes SQLite's date functions understand: 'YYYY-MM-DD HH:MM...' or with a 'T'.
+TEXT_DATETIME = re.compile(r'^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}')
+
+
+def sqlite_path(db: Any) -> Optional[str]:
+    """Return the SQLite file behind AstrBot's database object, if it is one."""
+    path = getattr(db, 'db_path', None)
+    if not isinstance(path, str) or not os.path.isfile(path):
+        return None
+    try:
+        with open(path, 'rb') as file:
+            return path if file.read(16) == b'SQLite format 3\x00' else None
+    except OSError:
+        return None
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _pick(columns: Sequence[str], candidates: Sequence[str]) -> Optional[str]:
+    return next((name for name in candidates if name in columns), None)
+
+
+def _hour(column: str) -> str:
+    # strftime accepts both ' ' and 'T' separators and yields NULL for anything else.
+    return f"strftime('%Y-%m-%d %H', {column})"
+
+
+def _parse_hour(value: str) -> Optional[datetime.datetime]:
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m-%d %H')
+    except (TypeError, ValueError):
+        return None
+
+
+class _Schema:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    def columns(self, table: str) -> List[str]:
+        return [row[1] for row in self.conn.execute(f"PRAGMA table_info({_quote(table)})")]
+
+    def find(self, tables: Sequence[str], *groups: Sequence[str]) -> Optional[Tuple[str, List[str]]]:
+        """First table that has a column from every candidate group, with the picked columns."""
+        for table in tables:
+            if table not in self.tables:
+                continue
+            columns = self.columns(table)
+            picked = [_pick(columns, group) for group in groups]
+            if all(picked):
+                return table, picked
+        return None
+
+    def text_datetimes(self, table: str, column: str) -> bool:
+        """Whether ``column`` holds text datetimes, judged by its first non-null row.
+
+        Epoch numbers or other formats would compare and bucket wrongly in
+        SQL, so those tables are left to the Python path.
+        """
+        row = self.conn.execute(
+            f"SELECT typeof({_quote(column)}), {_quote(column)} FROM {_quote(table)} WHERE {_quote(column)} IS NOT NULL LIMIT 1"
+        ).fetchone()
+        return row is None or (row[0] == 'text' and TEXT_DATETIME.match(row[1]) is not None)
+
+
+def query_dashboard_aggregates(path: str, since: datetime.datetime) -> Dict[str, Any]:
+    """Aggregate messages and token usage since ``since`` with grouped SQL.
+
+    Returns ``platform_hours`` as ``[(platform, hour, count)]`` plus
+    ``token_hours``, ``token_total`` and ``token_top``. A part is ``None`` when
+    its table or columns are not found, so the caller falls back per part.
+    Counts are summed per hour, which matches AstrBot's per-hour
+    ``platform_stats`` rows; cumulative counters still need the Python path.
+    Time columns that do not hold text datetimes also leave their part ``None``.
+    """
+    since_text = since.strftime('%Y-%m-%d %H:%M:%S')
+    result: Dict[str, Any] = {'platform_hours': None, 'token_hours': None, 'token_total': None, 'token_top': None}
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=2.0)
+    try:
+        schema = _Schema(conn)
+        found = schema.find(PLATFORM_TABLES, TIME_COLUMNS, PLATFORM_COLUMNS, COUNT_COLUMNS)
+        if found is not None and schema.text_datetimes(found[0], found[1][0]):
+            table, (ts, name, count) = found
+            ts, name, count = _quote(ts), _quote(name), _quote(count)
+            rows = conn.execute(
+                f"SELECT {name}, {_hour(ts)} AS hour, SUM({count}) FROM {_quote(table)} "
+                f"WHERE datetime({ts}) >= ? GROUP BY {name}, hour",
+                (since_text,),
+            ).fetchall()
+            result['platform_hours'] = [(str(platform), _parse_hour(hour), int(total or 0)) for platform, hour, total in rows]
+
+        found = schema.find(CONVERSATION_TABLES, UPDATED_COLUMNS, TOKEN_COLUMNS)
+        if found is not None and schema.text_datetimes(found[0], found[1][0]):
+            table, (ts, tokens) = found
+            labels = [_quote(column) for column in LABEL_COLUMNS if column in schema.columns(table)]
+            ts, tokens, table = _quote(ts), _quote(tokens), _quote(table)
+            label = f"COALESCE({', '.join(labels)}, 'conversation')" if labels else "'conversation'"
+            where = f"WHERE datetime({ts}) >= ? AND {tokens} > 0"
+            hours = conn.execute(f"SELECT {_hour(ts)} AS hour, SUM({tokens}) FROM {table} {where} GROUP BY hour", (since_text,)).fetchall()
+            result['token_hours'] = [(_parse_hour(hour), int(total or 0)) for hour, total in hours]
+            result['token_total'] = sum(total for _, total in result['token_hours'])
+            result['token_top'] = [
+                (str(name), int(value), ts_value)
+                for name, value, ts_value in conn.execute(f"SELECT {label}, {tokens}, {ts} FROM {table} {where} ORDER BY {tokens} DESC LIMIT 10", (since_text,))
+            ]
+    except sqlite3.Error as exc:
+        logger.warning(f"SQLite stats pushdown failed, using the Python path: {exc}")
+        return {key: None for key in result}
+    finally:
+        conn.close()
+    return result
@@ -0,0 +1,92 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from astrbot.api import logger
+
+
+class TaskStore:
+    """Scheduled ``sysinfo_auto`` tasks in a SQLite database (WAL mode).
+
+    Each task is one row holding its JSON definition and ``last_run``, so
+    creating or removing a task and recording a delivery are small
+    transactional writes instead of rewriting every task. An existing
+    ``auto_tasks.json`` is imported on first open and renamed to
+    ``auto_tasks.json.migrated``.
+    """
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS tasks (task_id TEXT PRIMARY KEY, payload TEXT NOT NULL, last_run REAL)")
+        if legacy_path:
+            self._migrate(legacy_path)
+
+    def _migrate(self, legacy_path: str):
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            tasks = data.get("tasks", {}) or {}
+            last_run = data.get("last_run", {}) or {}
+            with self._lock, self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO tasks (task_id, payload, last_run) VALUES (?, ?, ?)",
+                    [(task_id, json.dumps(task, ensure_ascii=False), last_run.get(task_id)) for task_id, task in tasks.items()],
+                )
+            # Only renamed once the rows are committed, so a crash here just repeats the import.
+            os.replace(legacy_path, legacy_path + ".migrated")
+            logger.info(f"Migrated {len(tasks)} auto tasks from {legacy_path}")
+        except Exception as exc:
+            logger.error(f"Failed to migrate auto tasks from {legacy_path}: {exc}")
+
+    def load(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, float]]:
+        tasks: Dict[str, Dict[str, Any]] = {}
+        last_run: Dict[str, float] = {}
+        with self._lock:
+            rows = self._conn.execute("SELECT task_id, payload, last_run FROM tasks").fetchall()
+        for task_id, payload, ran_at in rows:
+            try:
+                tasks[task_id] = json.loads(payload)
+            except ValueError:
+                logger.warning(f"Skipping unreadable auto task {task_id}")
+                continue
+            if ran_at is not None:
+                last_run[task_id] = float(ran_at)
+        return tasks, last_run
+
+    def _write(self, action: str, statement: str, rows: List[Tuple]):
+        if not rows:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(statement, rows)
+        except sqlite3.Error as exc:
+            logger.error(f"Failed to {action} auto tasks: {exc}")
+
+    def upsert(self, task_id: str, task: Dict[str, Any], last_run: Optional[float] = None):
+        self._write(
+            "save",
+            "INSERT INTO tasks (task_id, payload, last_run) VALUES (?, ?, ?) "
+            "ON CONFLICT(task_id) DO UPDATE SET payload = excluded.payload, last_run = COALESCE(excluded.last_run, tasks.last_run)",
+            [(task_id, json.dumps(task, ensure_ascii=False), last_run)],
+        )
+
+    def delete(self, task_ids: Iterable[str]):
+        self._write("delete", "DELETE FROM tasks WHERE task_id = ?", [(task_id,) for task_id in task_ids])
+
+    def mark_run(self, runs: Dict[str, float]):
+        """Record ``last_run`` for a batch of delivered tasks in one transaction."""
+        self._write("update", "UPDATE tasks SET last_run = ? WHERE task_id = ?", [(ran_at, task_id) for task_id, ran_at in runs.items()])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
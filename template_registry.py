@@ -0,0 +1,76 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from astrbot.api import logger
+
+try:
+    from jinja2 import Environment, TemplateSyntaxError
+except ImportError:  # pragma: no cover - jinja2 ships with AstrBot
+    Environment = None
+    TemplateSyntaxError = Exception
+
+
+class TemplateRegistry:
+    """Load dashboard templates once and reload them only when the file changes.
+
+    ``html_render`` takes template source, so the registry hands out the cached
+    string. A reload is parsed with jinja2 first; if the edited file has a
+    syntax error the last good version keeps being served.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._env = Environment() if Environment is not None else None
+        self._lock = threading.Lock()
+        # name -> ((mtime_ns, size), source)
+        self._entries: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self.reloads = 0
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def get(self, name: str) -> Optional[str]:
+        """Return the source of ``name``, or ``None`` if it was never loadable."""
+        path = self.path(name)
+        entry = self._entries.get(name)
+        try:
+            stat = os.stat(path)
+        except OSError as exc:
+            if entry is None:
+                logger.error(f"Failed to load template {name}: {exc}")
+                return None
+            return entry[1]
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            source = self._load(name, path)
+            if source is None:
+                if entry is None:
+                    return None
+                # Keep serving the last good template but stop re-parsing the broken file.
+                self._entries[name] = (signature, entry[1])
+                return entry[1]
+            self._entries[name] = (signature, source)
+            self.reloads += 1
+            return source
+
+    def _load(self, name: str, path: str) -> Optional[str]:
+        try:
+            with open(path, "r", encoding="utf-8-sig") as file:
+                source = file.read()
+        except Exception as exc:
+            logger.error(f"Failed to load template {name}: {exc}")
+            return None
+        if self._env is not None:
+            try:
+                self._env.parse(source, name=name)
+            except TemplateSyntaxError as exc:
+                logger.error(f"Template {name} has a syntax error at line {exc.lineno}, keeping the previous version: {exc}")
+                return None
+        logger.debug(f"Loaded template {name} ({len(source)} chars)")
+        return source
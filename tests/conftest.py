@@ -0,0 +1,16 @@
+import logging
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import astrbot.api  # noqa: F401
+except ImportError:
+    # The plugin modules under test only need astrbot's logger outside of AstrBot.
+    api = types.ModuleType("astrbot.api")
+    api.logger = logging.getLogger("astrbot")
+    api.AstrBotConfig = dict
+    sys.modules.setdefault("astrbot", types.ModuleType("astrbot"))
+    sys.modules["astrbot.api"] = api
@@ -0,0 +1,16 @@
+import background_cache
+from background_cache import BackgroundCache
+
+
+def test_without_pillow_large_files_are_skipped(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(background_cache, "Image", None)
+    monkeypatch.setattr(background_cache, "RAW_MAX_BYTES", 1024)
+    small, large = tmp_path / "small.png", tmp_path / "large.png"
+    small.write_bytes(b"x" * 100)
+    large.write_bytes(b"x" * 2048)
+    cache = BackgroundCache()
+    assert cache.data_uri(str(small)).startswith("data:image/png;base64,")
+    assert cache.data_uri(str(large)) == ""
+    assert cache.data_uri(str(large)) == ""
+    warnings = [record.getMessage() for record in caplog.records if record.levelname == "WARNING"]
+    assert len(warnings) == 2 and "large.png" in warnings[1]
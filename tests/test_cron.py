@@ -0,0 +1,78 @@
+import datetime
+
+import pytest
+
+from cron import CronSchedule, parse_schedule
+
+zoneinfo = pytest.importorskip("zoneinfo")
+
+
+def at(tz, *args):
+    return datetime.datetime(*args, tzinfo=zoneinfo.ZoneInfo(tz)).timestamp()
+
+
+def local(timestamp, tz):
+    return datetime.datetime.fromtimestamp(timestamp, zoneinfo.ZoneInfo(tz)).replace(tzinfo=None)
+
+
+def test_daily_with_time_zone():
+    schedule = parse_schedule("daily 09:30 Asia/Shanghai")
+    assert str(schedule) == "30 9 * * * Asia/Shanghai"
+    fire_at = schedule.next_after(at("Asia/Shanghai", 2026, 10, 17, 9, 30))
+    assert fire_at == at("Asia/Shanghai", 2026, 10, 18, 9, 30)
+    assert schedule.next_after(at("UTC", 2026, 10, 17, 0, 0)) == at("UTC", 2026, 10, 17, 1, 30)
+
+
+def test_trailing_time_zone_on_cron_expression():
+    schedule = parse_schedule("0 9 * * 1-5 Europe/Berlin")
+    # Saturday 2026-10-17 -> Monday 09:00 Berlin time.
+    assert local(schedule.next_after(at("Europe/Berlin", 2026, 10, 17, 12, 0)), "Europe/Berlin") == datetime.datetime(2026, 10, 19, 9, 0)
+
+
+def test_dst_gap_fires_after_the_gap():
+    # 02:30 does not exist in Berlin on 2026-03-29; the clock jumps from 02:00 to 03:00.
+    schedule = CronSchedule("30 2 * * *", "Europe/Berlin")
+    fire_at = schedule.next_after(at("Europe/Berlin", 2026, 3, 29, 0, 0))
+    assert local(fire_at, "Europe/Berlin") == datetime.datetime(2026, 3, 29, 3, 30)
+    assert local(schedule.next_after(fire_at), "Europe/Berlin") == datetime.datetime(2026, 3, 30, 2, 30)
+
+
+def test_dst_overlap_fires_once():
+    # 02:30 happens twice in Berlin on 2026-10-25.
+    schedule = CronSchedule("30 2 * * *", "Europe/Berlin")
+    first = schedule.next_after(at("Europe/Berlin", 2026, 10, 25, 0, 0))
+    assert local(first, "Europe/Berlin") == datetime.datetime(2026, 10, 25, 2, 30)
+    assert local(schedule.next_after(first), "Europe/Berlin") == datetime.datetime(2026, 10, 26, 2, 30)
+
+
+def test_impossible_date_raises():
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 30 2 *").next_after(at("UTC", 2026, 1, 1, 0, 0))
+
+
+@pytest.mark.parametrize("weekday", ["7", "0", "sun"])
+def test_sunday_spellings(weekday):
+    schedule = CronSchedule(f"0 8 * * {weekday}", "UTC")
+    assert local(schedule.next_after(at("UTC", 2026, 10, 17, 12, 0)), "UTC") == datetime.datetime(2026, 10, 18, 8, 0)
+
+
+def test_weekday_range_ending_in_seven():
+    assert CronSchedule("0 8 * * 5-7").weekdays == {5, 6, 0}
+
+
+def test_star_step_day_field_combines_with_weekday():
+    schedule = CronSchedule("0 0 */2 * 1", "UTC")
+    fire_at = local(schedule.next_after(at("UTC", 2026, 10, 17, 0, 0)), "UTC")
+    assert fire_at == datetime.datetime(2026, 10, 19, 0, 0)
+
+
+def test_restricted_day_fields_combine_with_or():
+    schedule = CronSchedule("0 0 1 * 1", "UTC")
+    assert local(schedule.next_after(at("UTC", 2026, 10, 17, 0, 0)), "UTC") == datetime.datetime(2026, 10, 19, 0, 0)
+    assert local(schedule.next_after(at("UTC", 2026, 10, 27, 0, 0)), "UTC") == datetime.datetime(2026, 11, 1, 0, 0)
+
+
+@pytest.mark.parametrize("text", ["0 9 * *", "61 9 * * *", "0 9 * * 8", "daily 24:00", "0 9 * * * Nope/Zone"])
+def test_invalid_schedules(text):
+    with pytest.raises(ValueError):
+        parse_schedule(text)
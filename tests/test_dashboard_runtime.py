@@ -0,0 +1,69 @@
+import asyncio
+import datetime
+
+from dashboard_runtime import collect_astrbot_dashboard_stats, dashboard_texts, extract_value
+
+
+class FakeDB:
+    def __init__(self, platform_rows):
+        self.platform_rows = platform_rows
+
+    def get_platform_stats(self, offset_sec=86400):
+        since = datetime.datetime.now() - datetime.timedelta(seconds=offset_sec)
+        return [row for row in self.platform_rows if row["timestamp"] >= since]
+
+
+class FakeConversations:
+    def __init__(self, conversations):
+        self.conversations = conversations
+
+    def get_filtered_conversations(self, page=1, page_size=100, **kwargs):
+        return self.conversations[(page - 1) * page_size:page * page_size], len(self.conversations)
+
+
+class FakeContext:
+    def __init__(self, db, conversations=()):
+        self.db = db
+        self.conversation_manager = FakeConversations(list(conversations))
+
+    def get_all_stars(self):
+        return []
+
+
+def test_one_hour_window_is_one_hourly_bucket():
+    hour = datetime.datetime.now().replace(minute=0, second=0, microsecond=0)
+    context = FakeContext(FakeDB([{"timestamp": hour, "platform_id": "qq", "count": 42}]))
+    stats = asyncio.run(collect_astrbot_dashboard_stats(context, window="1h"))
+    points = stats["message_chart"]["points_data"]
+    assert [(point["label"], point["value"]) for point in points] == [(hour.strftime("%H:00"), "42")]
+
+
+def test_week_token_bars_are_daily():
+    now = datetime.datetime.now()
+    conversations = [{"title": f"c{i}", "token_usage": 10, "updated_at": now - datetime.timedelta(hours=6 * i)} for i in range(20)]
+    stats = asyncio.run(collect_astrbot_dashboard_stats(FakeContext(FakeDB([]), conversations), window="7d"))
+    labels = [bar["label"] for bar in stats["token_chart_bars"]]
+    assert len(labels) == 7 and len(set(labels)) == 7
+    assert labels[-1] == now.strftime("%m-%d")
+    assert stats["today_tokens"] == 200
+
+
+def test_token_card_label_follows_window():
+    assert dashboard_texts("en", "7d")["window_tokens"] == "7d Tokens"
+    assert dashboard_texts("zh", "30d")["window_tokens"] == "30 天 Tokens"
+
+
+def test_extract_value_accepts_one_shot_iterables():
+    class Open:
+        def __init__(self):
+            self.a = 1
+
+    class Slotted:
+        __slots__ = ("a",)
+
+        def __init__(self):
+            self.a = 2
+
+    assert extract_value(Open(), (name for name in ["a"])) == 1
+    assert extract_value(Open(), (name for name in ["a"])) == 1
+    assert extract_value(Slotted(), iter(["missing", "a"])) == 2
@@ -0,0 +1,77 @@
+import asyncio
+import datetime
+
+import pytest
+
+from dashboard_runtime import collect_astrbot_dashboard_stats
+from platform_stats import PlatformStatsAggregator
+
+
+class FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.offsets = []
+
+    def get_platform_stats(self, offset_sec=86400):
+        self.offsets.append(offset_sec)
+        since = datetime.datetime.now() - datetime.timedelta(seconds=offset_sec)
+        return [row for row in self.rows if row["timestamp"] >= since]
+
+
+class FakeContext:
+    def __init__(self, db):
+        self.db = db
+
+    def get_all_stars(self):
+        return []
+
+
+def hourly_rows(values, platform="qq"):
+    now = datetime.datetime.now().replace(minute=0, second=0, microsecond=0)
+    return [{"timestamp": now - datetime.timedelta(hours=len(values) - 1 - i), "platform_id": platform, "count": value} for i, value in enumerate(values)]
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [100, 150],  # cumulative counter
+        [10, 15, 20],  # per-hour counts that happen to rise
+        [5, 3, 8, 2],  # per-hour counts
+        [10, 20, 30, 40, 50],
+    ],
+)
+def test_fresh_aggregate_matches_legacy(values):
+    context = FakeContext(FakeDB(hourly_rows(values)))
+    fresh = asyncio.run(collect_astrbot_dashboard_stats(context, aggregator=PlatformStatsAggregator()))
+    legacy = asyncio.run(collect_astrbot_dashboard_stats(context))
+    assert fresh["message_total"] == legacy["message_total"]
+    assert fresh["platform_ranking"] == legacy["platform_ranking"]
+    assert fresh["message_chart"] == legacy["message_chart"]
+
+
+def test_mode_is_kept_after_first_fetch():
+    now = datetime.datetime.now().replace(minute=0, second=0, microsecond=0)
+    aggregator = PlatformStatsAggregator()
+    rows = hourly_rows([100, 150])
+    aggregator.ingest(rows, now.timestamp())
+    # A lower value later must not flip the counter to per-hour counts.
+    aggregator.ingest(rows + [{"timestamp": now + datetime.timedelta(hours=1), "platform_id": "qq", "count": 120}], now.timestamp())
+    assert aggregator.ranking(now - datetime.timedelta(hours=2)) == {"qq": 150}
+
+
+def test_in_place_bump_adds_difference():
+    now = datetime.datetime.now().replace(minute=0, second=0, microsecond=0)
+    aggregator = PlatformStatsAggregator()
+    aggregator.ingest(hourly_rows([5, 3]), now.timestamp())
+    aggregator.ingest(hourly_rows([5, 7]), now.timestamp())
+    assert aggregator.ranking(now - datetime.timedelta(hours=2)) == {"qq": 12}
+
+
+def test_refresh_ignores_idle_platform_marks():
+    db = FakeDB([])
+    aggregator = PlatformStatsAggregator()
+    asyncio.run(aggregator.refresh(db, 24))
+    old = datetime.datetime.now() - datetime.timedelta(days=20)
+    aggregator.ingest([{"timestamp": old, "platform_id": "idle", "count": 1}])
+    asyncio.run(aggregator.refresh(db, 24))
+    assert db.offsets == [86400, 3600]
@@ -0,0 +1,38 @@
+import os
+import time
+
+from render_cache import RenderCache, prune_directory
+
+
+def test_evicted_values_are_reported():
+    evicted = []
+    cache = RenderCache(ttl=60, max_entries=2, on_evict=evicted.append)
+    cache.put("a", "http://a")
+    cache.put("b", "http://b")
+    cache.put("a", "http://a2")
+    cache.put("c", "http://c")
+    assert evicted == ["http://a", "http://b"]
+    cache.clear()
+    assert sorted(evicted[2:]) == ["http://a2", "http://c"]
+
+
+def test_expired_entry_is_evicted():
+    evicted = []
+    cache = RenderCache(ttl=60, max_entries=2, on_evict=evicted.append)
+    cache.put("a", "http://a")
+    assert cache.get("a", ttl=0) is None
+    assert evicted == ["http://a"]
+
+
+def test_prune_directory_keeps_newest_and_young_files(tmp_path):
+    now = time.time()
+    for index in range(5):
+        path = tmp_path / f"sysinfo_{index}.png"
+        path.write_bytes(b"x")
+        os.utime(path, (now - 1000 + index, now - 1000 + index))
+    young = tmp_path / "sysinfo_young.png"
+    young.write_bytes(b"x")
+    assert prune_directory(str(tmp_path), keep=1, min_age=0) == 5
+    assert os.listdir(tmp_path) == ["sysinfo_young.png"]
+    (tmp_path / "other.png").write_bytes(b"x")
+    assert prune_directory(str(tmp_path), keep=0, min_age=60) == 0
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from scheduler import TaskScheduler, next_fire, staggered_fire
+
+
+async def collect(scheduler_kwargs, steps, wait):
+    """Start a scheduler, run ``steps(scheduler)`` and return the batches handed to ``on_due``."""
+    batches = []
+
+    async def on_due(due):
+        batches.append((time.time(), due))
+
+    scheduler = TaskScheduler(on_due, **scheduler_kwargs)
+    scheduler.start()
+    try:
+        await steps(scheduler)
+        await asyncio.sleep(wait)
+    finally:
+        await scheduler.stop()
+    return scheduler, batches
+
+
+def test_reschedule_and_cancel():
+    async def steps(scheduler):
+        now = time.time()
+        scheduler.schedule("a", now + 0.3)
+        scheduler.schedule("b", now + 0.1)
+        scheduler.schedule("a", now + 0.05)
+        scheduler.cancel("b")
+        assert len(scheduler) == 1 and "b" not in scheduler
+
+    scheduler, batches = asyncio.run(collect({}, steps, 0.5))
+    assert [[task_id for task_id, _ in due] for _, due in batches] == [["a"]]
+    assert len(scheduler) == 0
+
+
+def test_earlier_task_wakes_the_loop():
+    async def steps(scheduler):
+        scheduler.schedule("late", time.time() + 60)
+        await asyncio.sleep(0.05)  # the loop is now sleeping until "late"
+        scheduler.schedule("soon", time.time() + 0.05)
+
+    started = time.time()
+    scheduler, batches = asyncio.run(collect({}, steps, 0.3))
+    assert [due for _, due in batches][0][0][0] == "soon"
+    assert batches[0][0] - started < 0.3
+    assert scheduler.next_deadline("late") is not None
+
+
+def test_lead_hands_tasks_over_early_with_their_fire_time():
+    fire_at = []
+
+    async def steps(scheduler):
+        fire_at.append(time.time() + 0.4)
+        scheduler.schedule("a", fire_at[0])
+
+    _, batches = asyncio.run(collect({"lead": 0.3}, steps, 0.3))
+    assert len(batches) == 1
+    handed_at, due = batches[0]
+    assert due == [("a", fire_at[0])]
+    assert handed_at < fire_at[0] - 0.2
+
+
+def test_same_deadline_is_one_batch():
+    async def steps(scheduler):
+        now = time.time() + 0.05
+        for task_id in ("a", "b", "c"):
+            scheduler.schedule(task_id, now)
+
+    _, batches = asyncio.run(collect({}, steps, 0.2))
+    assert len(batches) == 1 and sorted(task_id for task_id, _ in batches[0][1]) == ["a", "b", "c"]
+
+
+def test_next_fire_skips_missed_intervals():
+    assert next_fire(100.0, 60.0, now=130.0) == 160.0
+    assert next_fire(100.0, 60.0, now=410.0) == 460.0
+
+
+def test_staggered_fire_keeps_a_stable_phase():
+    first = staggered_fire("session", 3600.0, 1000.0)
+    assert 1000.0 < first <= 4600.0
+    assert staggered_fire("session", 3600.0, first) == first + 3600.0
@@ -0,0 +1,32 @@
+import datetime
+import sqlite3
+
+from stats_pushdown import query_dashboard_aggregates
+
+
+def make_db(path, stamps):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE platform_stats (id INTEGER PRIMARY KEY, timestamp, platform_id TEXT, count INTEGER)")
+    conn.executemany("INSERT INTO platform_stats (timestamp, platform_id, count) VALUES (?, ?, ?)", [(stamp, "qq", 5) for stamp in stamps])
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def test_space_and_t_separated_datetimes(tmp_path):
+    path = make_db(tmp_path / "data.db", ["2026-10-17 09:10:00", "2026-10-17T09:40:00.123456", "2026-10-17T11:00:00", "2026-10-16 08:00:00"])
+    result = query_dashboard_aggregates(path, datetime.datetime(2026, 10, 17, 9, 5))
+    assert sorted(result["platform_hours"]) == [
+        ("qq", datetime.datetime(2026, 10, 17, 9), 10),
+        ("qq", datetime.datetime(2026, 10, 17, 11), 5),
+    ]
+
+
+def test_epoch_timestamps_fall_back(tmp_path):
+    path = make_db(tmp_path / "data.db", [1792220400, 1792224000])
+    assert query_dashboard_aggregates(path, datetime.datetime(2026, 10, 17))["platform_hours"] is None
+
+
+def test_unexpected_text_falls_back(tmp_path):
+    path = make_db(tmp_path / "data.db", ["17/10/2026 09:00"])
+    assert query_dashboard_aggregates(path, datetime.datetime(2026, 10, 17))["platform_hours"] is None
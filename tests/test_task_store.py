@@ -0,0 +1,71 @@
+import json
+import os
+
+from task_store import TaskStore
+
+
+def write_legacy(path, tasks, last_run):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"tasks": tasks, "last_run": last_run}, file)
+
+
+def test_migrates_legacy_json_once(tmp_path):
+    db, legacy = str(tmp_path / "auto_tasks.db"), str(tmp_path / "auto_tasks.json")
+    write_legacy(legacy, {"a": {"interval": 3600}, "b": {"cron": "0 9 * * *"}}, {"a": 100.0})
+    store = TaskStore(db, legacy)
+    assert store.load() == ({"a": {"interval": 3600}, "b": {"cron": "0 9 * * *"}}, {"a": 100.0})
+    assert not os.path.exists(legacy) and os.path.exists(legacy + ".migrated")
+    store.delete(["b"])
+    store.close()
+
+    store = TaskStore(db, legacy)
+    assert store.load() == ({"a": {"interval": 3600}}, {"a": 100.0})
+    store.close()
+
+
+def test_repeated_import_does_not_overwrite(tmp_path):
+    # A crash between committing the rows and renaming the file imports the same JSON again.
+    db, legacy = str(tmp_path / "auto_tasks.db"), str(tmp_path / "auto_tasks.json")
+    write_legacy(legacy, {"a": {"interval": 3600}}, {"a": 100.0})
+    store = TaskStore(db, legacy)
+    store.upsert("a", {"interval": 60})
+    store.mark_run({"a": 200.0})
+    store.close()
+    os.replace(legacy + ".migrated", legacy)
+    store = TaskStore(db, legacy)
+    assert store.load() == ({"a": {"interval": 60}}, {"a": 200.0})
+    assert store._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 1
+    store.close()
+
+
+def test_reopen_keeps_tasks(tmp_path):
+    db = str(tmp_path / "auto_tasks.db")
+    store = TaskStore(db, str(tmp_path / "missing.json"))
+    store.upsert("a", {"interval": 60, "title": "报告"})
+    store.close()
+    assert TaskStore(db).load() == ({"a": {"interval": 60, "title": "报告"}}, {})
+
+
+def test_upsert_keeps_last_run_unless_given(tmp_path):
+    store = TaskStore(str(tmp_path / "auto_tasks.db"))
+    store.upsert("a", {"interval": 60}, last_run=10.0)
+    store.upsert("a", {"interval": 120})
+    assert store.load() == ({"a": {"interval": 120}}, {"a": 10.0})
+    store.upsert("a", {"interval": 120}, last_run=20.0)
+    assert store.load()[1] == {"a": 20.0}
+
+
+def test_delete_and_mark_run(tmp_path):
+    store = TaskStore(str(tmp_path / "auto_tasks.db"))
+    for task_id in ("a", "b", "c"):
+        store.upsert(task_id, {"interval": 60})
+    store.mark_run({"a": 1.0, "b": 2.0, "gone": 3.0})
+    store.delete(["c", "unknown"])
+    assert store.load() == ({"a": {"interval": 60}, "b": {"interval": 60}}, {"a": 1.0, "b": 2.0})
+
+
+def test_unreadable_payload_is_skipped(tmp_path):
+    store = TaskStore(str(tmp_path / "auto_tasks.db"))
+    store.upsert("a", {"interval": 60})
+    store._conn.execute("INSERT INTO tasks (task_id, payload, last_run) VALUES ('bad', '{', 5)")
+    assert store.load() == ({"a": {"interval": 60}}, {})
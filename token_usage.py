@@ -0,0 +1,126 @@
+import asyncio
+import datetime
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from astrbot.api import logger
+
+from dashboard_runtime import extract_datetime, extract_number, extract_value, maybe_await, truncate
+
+PAGE_SIZE = 100
+
+
+def _parse_page(result: Any) -> Tuple[List[Any], int]:
+    if isinstance(result, dict):
+        return list(result.get('conversations', []) or []), int(result.get('total', 0) or 0)
+    if isinstance(result, (list, tuple)) and len(result) >= 2:
+        return list(result[0] or []), int(result[1] or 0)
+    return [], 0
+
+
+class TokenUsageIndex:
+    """Per-conversation token usage keyed by ``updated_at``, refreshed incrementally.
+
+    ``get_filtered_conversations`` returns the most recently updated
+    conversations first, so a refresh pages until it reaches the watermark
+    (the newest ``updated_at`` already indexed). A full rescan runs on first
+    use and every ``rescan_interval`` seconds to drop deleted conversations;
+    it fetches pages in concurrent batches and stops once a batch reaches
+    past the retention window. If the manager turns out not to sort by
+    ``updated_at``, every page is read instead.
+    """
+
+    def __init__(self, retention_hours: int = 24 * 31, rescan_interval: float = 3600, concurrency: int = 4):
+        self.retention = max(1, int(retention_hours)) * 3600
+        self.rescan_interval = max(60.0, float(rescan_interval))
+        self.concurrency = max(1, int(concurrency))
+        # conversation key -> (updated_at, token usage, display name)
+        self._entries: Dict[str, Tuple[datetime.datetime, int, str]] = {}
+        self._watermark: Optional[datetime.datetime] = None
+        self._last_full = 0.0
+        self._ordered = True
+        self._lock = asyncio.Lock()
+        self.pages_fetched = 0
+
+    async def _fetch(self, manager: Any, page: int) -> Tuple[List[Any], int]:
+        result = await maybe_await(manager.get_filtered_conversations(page=page, page_size=PAGE_SIZE, platform_ids=[], search_query='', message_types=[], exclude_ids=[], exclude_platforms=[]))
+        self.pages_fetched += 1
+        return _parse_page(result)
+
+    def _ingest(self, conversations: List[Any], entries: Dict[str, Tuple[datetime.datetime, int, str]]) -> Optional[datetime.datetime]:
+        """Index one page; returns its oldest ``updated_at``."""
+        oldest, previous = None, None
+        for conv in conversations:
+            updated_at = extract_datetime(conv, ['updated_at', 'created_at', 'timestamp'])
+            if updated_at is None:
+                continue
+            if previous is not None and updated_at > previous:
+                self._ordered = False
+            previous = updated_at
+            oldest = updated_at if oldest is None else min(oldest, updated_at)
+            name = str(extract_value(conv, ['title', 'conversation_id', 'user_id'], 'conversation'))
+            key = str(extract_value(conv, ['conversation_id', 'cid', 'id'], '') or f"{name}@{extract_value(conv, ['user_id'], '')}")
+            entries[key] = (updated_at, int(extract_number(conv, ['token_usage', 'tokens', 'total_tokens'], 0)), name)
+        return oldest
+
+    async def _full_scan(self, manager: Any, cutoff: datetime.datetime):
+        entries: Dict[str, Tuple[datetime.datetime, int, str]] = {}
+        conversations, total = await self._fetch(manager, 1)
+        oldest = self._ingest(conversations, entries)
+        pages = -(-total // PAGE_SIZE) if total else None
+        more = total > PAGE_SIZE if total else len(conversations) >= PAGE_SIZE
+        page = 2
+        while more and (not self._ordered or oldest is None or oldest >= cutoff):
+            # Pages are fetched ``concurrency`` at a time so the age check can stop the scan early.
+            last = page + self.concurrency - 1 if pages is None else min(pages, page + self.concurrency - 1)
+            results = await asyncio.gather(*(self._fetch(manager, number) for number in range(page, last + 1)))
+            for conversations, _ in results:
+                page_oldest = self._ingest(conversations, entries)
+                if page_oldest is not None:
+                    oldest = page_oldest if oldest is None else min(oldest, page_oldest)
+                if len(conversations) < PAGE_SIZE:
+                    more = False
+            page = last + 1
+            if pages is not None and page > pages:
+                more = False
+        self._entries = entries
+
+    async def _incremental(self, manager: Any):
+        page = 1
+        while True:
+            conversations, total = await self._fetch(manager, page)
+            oldest = self._ingest(conversations, self._entries)
+            if oldest is None or oldest <= self._watermark or len(conversations) < PAGE_SIZE or (total and page * PAGE_SIZE >= total):
+                return
+            page += 1
+
+    async def refresh(self, manager: Any) -> bool:
+        if manager is None or not hasattr(manager, 'get_filtered_conversations'):
+            return False
+        async with self._lock:
+            now = time.time()
+            cutoff = datetime.datetime.fromtimestamp(now - self.retention)
+            try:
+                if self._watermark is None or not self._ordered or now - self._last_full >= self.rescan_interval:
+                    started = time.perf_counter()
+                    await self._full_scan(manager, cutoff)
+                    self._last_full = now
+                    logger.debug(f"Token usage full scan: {len(self._entries)} conversations in {(time.perf_counter() - started) * 1000:.0f}ms")
+                else:
+                    await self._incremental(manager)
+            except Exception as exc:
+                logger.warning(f"Token usage refresh failed: {exc}")
+                return bool(self._entries)
+            for key in [key for key, entry in self._entries.items() if entry[0] < cutoff]:
+                del self._entries[key]
+            if self._entries:
+                self._watermark = max(entry[0] for entry in self._entries.values())
+        return True
+
+    def rows(self, since: datetime.datetime) -> List[Dict[str, Any]]:
+        """Conversations updated since ``since`` with token usage, shaped like the dashboard rows."""
+        return [
+            {'name': truncate(name, 54), 'value': tokens, 'timestamp': updated_at}
+            for updated_at, tokens, name in self._entries.values()
+            if tokens > 0 and updated_at >= since
+        ]
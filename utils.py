@@ -1,10 +1,11 @@
 import os
-import base64
 import platform
 import subprocess
 import logging
 from typing import Dict, Any, Optional, Tuple
 
+from background_cache import BACKGROUND_CACHE
+
 logger = logging.getLogger("astrbot")
 
 def detect_linux_distro() -> str:
@@ -156,8 +157,13 @@ def resolve_background(mode: str,
                        url: str,
                        file_path: str,
                        auto_background: bool,
-                       fit: str) -> Tuple[str, str]:
-    """Resolve background image URL/data and CSS fit property."""
+                       fit: str,
+                       canvas: Optional[Tuple[int, int]] = None) -> Tuple[str, str]:
+    """Resolve background image URL/data and CSS fit property.
+
+    Local files go through ``BACKGROUND_CACHE``, which fits them to ``canvas``
+    once per file version instead of re-encoding them on every render.
+    """
     if auto_background and mode == "none":
         if url:
             mode = "url"
@@ -178,11 +184,7 @@ def resolve_background(mode: str,
                     else:
                         fp = os.path.join(os.path.dirname(__file__), fp)
 
-            with open(fp, "rb") as f:
-                data = f.read()
-            ext = os.path.splitext(fp)[1][1:] or "jpeg"
-            mime = f"image/{ext}"
-            bg_image = "data:" + mime + ";base64," + base64.b64encode(data).decode()
+            bg_image = BACKGROUND_CACHE.data_uri(fp, canvas, fit)
         except Exception:
             bg_image = ""
 